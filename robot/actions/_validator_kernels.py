@@ -0,0 +1,111 @@
+"""ActionValidator 分析用的 numba 内核
+
+输入为 frames.frames_to_arrays 生成的结构数组，缺失角度以 NaN 表示。
+未安装 numba 时 AVAILABLE 为 False，由调用方回退到 NumPy 实现。
+内核依赖 NaN 判断缺失值，因此不启用 fastmath。
+"""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+AVAILABLE = njit is not None
+
+if AVAILABLE:
+    @njit(cache=True)
+    def analyze_velocities(angles, delays):
+        """返回所有有效相邻帧的角速度(一维数组)"""
+        n, s = angles.shape
+        out = np.empty(max(n - 1, 0) * s)
+        count = 0
+        for i in range(1, n):
+            dt = delays[i - 1]
+            for j in range(s):
+                d = angles[i, j] - angles[i - 1, j]
+                if d == d:
+                    out[count] = abs(d) / dt
+                    count += 1
+        return out[:count]
+        
+    @njit(cache=True)
+    def analyze_energy(angles, delays):
+        """返回 (总能量, 能量峰值帧数)"""
+        n, s = angles.shape
+        total_energy = 0.0
+        peaks = 0
+        for i in range(1, n):
+            dt = delays[i - 1]
+            frame_energy = 0.0
+            for j in range(s):
+                d = angles[i, j] - angles[i - 1, j]
+                if d == d:
+                    velocity = abs(d) / dt
+                    frame_energy += velocity * velocity * dt
+            total_energy += frame_energy
+            if frame_energy > total_energy / n * 2:
+                peaks += 1
+        return total_energy, peaks
+        
+    @njit(cache=True)
+    def analyze_complexity(angles):
+        """返回各舵机运动方向变化的总次数"""
+        n, s = angles.shape
+        directions = np.zeros(s)
+        has_direction = np.zeros(s, dtype=np.bool_)
+        changes = 0
+        for i in range(1, n):
+            for j in range(s):
+                d = angles[i, j] - angles[i - 1, j]
+                if d != d:
+                    continue
+                curr_dir = 1.0 if d > 0 else (-1.0 if d < 0 else 0.0)
+                if has_direction[j] and curr_dir != directions[j]:
+                    changes += 1
+                directions[j] = curr_dir
+                has_direction[j] = True
+        return changes
+        
+    @njit(cache=True)
+    def find_limit_violations(angles, min_limits, max_limits):
+        """扫描超出限位的角度，返回违规项的 (行索引, 列索引)
+        
+        先计数再填充，只为违规项分配输出，不生成 [帧数, 舵机数] 的掩码。
+        """
+        n, s = angles.shape
+        count = 0
+        for i in range(n):
+            for j in range(s):
+                angle = angles[i, j]
+                if angle < min_limits[j] or angle > max_limits[j]:
+                    count += 1
+                    
+        rows = np.empty(count, dtype=np.intp)
+        cols = np.empty(count, dtype=np.intp)
+        k = 0
+        for i in range(n):
+            for j in range(s):
+                angle = angles[i, j]
+                if angle < min_limits[j] or angle > max_limits[j]:
+                    rows[k] = i
+                    cols[k] = j
+                    k += 1
+        return rows, cols
+
+
+def warmup():
+    """预编译全部内核
+    
+    内核在首次调用时才 JIT 编译（有 cache=True 时读取磁盘缓存），
+    导入本模块不会触发编译。对首次分析延迟敏感的调用方可在启动时
+    显式调用本函数。未安装 numba 时不做任何事。
+    """
+    if not AVAILABLE:
+        return
+    angles = np.zeros((2, 1))
+    delays = np.full(2, 0.02)
+    analyze_velocities(angles, delays)
+    analyze_energy(angles, delays)
+    analyze_complexity(angles)
+    find_limit_violations(angles, np.full(1, -np.inf), np.full(1, np.inf))
@@ -0,0 +1,32 @@
+from typing import List, Dict, Tuple
+import numpy as np
+
+__all__ = ['DEFAULT_DELAY', 'frames_to_arrays']
+
+# 帧未设置延时时使用的默认延时(秒)
+DEFAULT_DELAY = 0.02
+
+def frames_to_arrays(frames: List[Dict],
+                     missing_delay: float = DEFAULT_DELAY) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """将动作序列转换为结构数组(SoA)
+    
+    Args:
+        frames: 动作序列
+        missing_delay: 帧未设置延时时填入的值，传入 NaN 可保留缺失信息
+        
+    Returns:
+        (舵机ID列表, 角度数组[帧数, 舵机数](缺失为 NaN), 延时数组[帧数])
+    """
+    servo_ids = list(dict.fromkeys(
+        k for frame in frames for k in frame if k != 'delay'))
+    index = {servo_id: j for j, servo_id in enumerate(servo_ids)}
+    
+    angles = np.full((len(frames), len(servo_ids)), np.nan)
+    for i, frame in enumerate(frames):
+        for servo_id, angle in frame.items():
+            if servo_id != 'delay':
+                angles[i, index[servo_id]] = angle
+                
+    delays = np.fromiter((frame.get('delay', missing_delay) for frame in frames),
+                         dtype=float, count=len(frames))
+    return servo_ids, angles, delays
@@ -1,8 +1,23 @@
 from typing import List, Dict, Optional
 import numpy as np
 import logging
+from functools import lru_cache
 from scipy.interpolate import CubicSpline
 
+
+@lru_cache(maxsize=32)
+def _cubic_basis(times: tuple, new_times: tuple) -> np.ndarray:
+    """三次样条插值基矩阵
+
+    对单位矩阵做样条插值，得到 (len(new_times), len(times)) 的矩阵 M，
+    对任意角度数据 y 有 CubicSpline(times, y)(new_times) == M @ y。
+    结果只依赖于时间序列，可在相同帧数和插值点数的调用之间复用。
+    """
+    basis = CubicSpline(np.asarray(times), np.eye(len(times)))(np.asarray(new_times))
+    basis.setflags(write=False)
+    return basis
+
+
 class ActionInterpolator:
     def __init__(self, logger: logging.Logger = None):
         """动作插值器"""
@@ -103,36 +118,31 @@ class ActionInterpolator:
             return frames
             
         # 获取所有舵机ID
-        servo_ids = set()
-        for frame in frames:
-            servo_ids.update(k for k in frame.keys() if k != 'delay')
+        servo_ids = list(dict.fromkeys(
+            k for frame in frames for k in frame.keys() if k != 'delay'))
             
         # 构建时间序列
         times = np.zeros(len(frames))
         for i in range(1, len(frames)):
             times[i] = times[i-1] + frames[i-1].get('delay', 0.02)
             
-        # 对每个舵机进行插值
-        interpolated = []
+        # 收集角度数据(缺失时使用最近的有效角度)
+        angles = np.empty((len(frames), len(servo_ids)))
+        last = dict.fromkeys(servo_ids, 0)
+        for i, f in enumerate(frames):
+            last.update((k, v) for k, v in f.items() if k != 'delay')
+            angles[i] = [last[servo_id] for servo_id in servo_ids]
+            
+        # 样条关于角度是线性的，插值结果 = 基矩阵 @ 角度
         new_times = np.linspace(times[0], times[-1], num_points)
+        basis = _cubic_basis(tuple(times.tolist()), tuple(new_times.tolist()))
+        values = basis @ angles
         
-        for t in new_times:
-            frame = {'delay': (times[-1] - times[0]) / (num_points - 1)}
-            
-            for servo_id in servo_ids:
-                # 收集角度数据
-                angles = []
-                for f in frames:
-                    if servo_id in f:
-                        angles.append(f[servo_id])
-                    else:
-                        # 使用最近的有效角度
-                        angles.append(angles[-1] if angles else 0)
-                        
-                # 创建样条插值器
-                cs = CubicSpline(times, angles)
-                frame[servo_id] = float(cs(t))
-                
+        delay = (times[-1] - times[0]) / (num_points - 1)
+        interpolated = []
+        for row in values.tolist():
+            frame = {'delay': delay}
+            frame.update(zip(servo_ids, row))
             interpolated.append(frame)
             
         return interpolated
@@ -199,53 +209,43 @@ class ActionInterpolator:
         Returns:
             插值后的帧序列
         """
-        def _slerp(start: float, end: float, t: float) -> float:
-            """球面线性插值"""
-            # 将角度转换为弧度
-            start_rad = np.radians(start)
-            end_rad = np.radians(end)
-            
-            # 计算最短路径
-            diff = end_rad - start_rad
-            if abs(diff) > np.pi:
-                if diff > 0:
-                    end_rad -= 2 * np.pi
-                else:
-                    end_rad += 2 * np.pi
-                    
-            # 执行插值
-            result = start_rad + (end_rad - start_rad) * t
-            return np.degrees(result)
-            
         if len(frames) < 2:
             return frames
             
-        # 获取所有舵机ID
-        servo_ids = set()
-        for frame in frames:
-            servo_ids.update(k for k in frame.keys() if k != 'delay')
-            
+        # 获取所有舵机ID，并构建角度数组(缺失为 NaN)
+        servo_ids = list(dict.fromkeys(
+            k for frame in frames for k in frame.keys() if k != 'delay'))
+        angles = np.array([[frame.get(servo_id, np.nan) for servo_id in servo_ids]
+                           for frame in frames], dtype=float).reshape(len(frames), -1)
+                           
+        # 每段的起点和终点(缺失起点取 0，缺失终点取起点)
+        seg_start = np.nan_to_num(angles[:-1], nan=0.0)
+        seg_end = np.where(np.isnan(angles[1:]), seg_start, angles[1:])
+        
+        # 计算最短路径(取模回绕到 [-pi, pi)，无分支)
+        diff = np.radians(seg_end - seg_start)
+        diff = np.degrees((diff + np.pi) % (2 * np.pi) - np.pi)
+        
+        # 找到每个插值点对应的关键帧段
+        num_segments = len(frames) - 1
+        segment_t = np.linspace(0, 1, num_points) * num_segments
+        segment_boundaries = np.arange(len(frames))
+        idx = np.minimum(
+            np.searchsorted(segment_boundaries, segment_t, side='right') - 1,
+            num_segments - 1)
+        local_t = segment_t - idx
+        
+        # 一次性计算所有插值点
+        values = seg_start[idx] + local_t[:, None] * diff[idx]
+        
         # 生成插值序列
-        interpolated = []
         total_time = sum(frame.get('delay', 0.02) for frame in frames[:-1])
+        delay = total_time / (num_points - 1)
         
-        for i in range(num_points):
-            t = i / (num_points - 1)
-            frame = {'delay': total_time / (num_points - 1)}
-            
-            # 找到对应的关键帧段
-            segment_t = t * (len(frames) - 1)
-            idx = int(segment_t)
-            if idx >= len(frames) - 1:
-                idx = len(frames) - 2
-            local_t = segment_t - idx
-            
-            # 对每个舵机进行插值
-            for servo_id in servo_ids:
-                start = frames[idx].get(servo_id, 0)
-                end = frames[idx + 1].get(servo_id, start)
-                frame[servo_id] = _slerp(start, end, local_t)
-                
+        interpolated = []
+        for row in values.tolist():
+            frame = {'delay': delay}
+            frame.update(zip(servo_ids, row))
             interpolated.append(frame)
             
         return interpolated
@@ -1,6 +1,68 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import numpy as np
 import logging
+from functools import lru_cache
+from .frames import DEFAULT_DELAY, frames_to_arrays
+
+__all__ = ['ActionOptimizer']
+
+
+def _soa_to_frames(servo_ids: List[str], angles: np.ndarray,
+                   delays: np.ndarray,
+                   keys: Optional[List[Tuple[str, ...]]] = None) -> List[Dict]:
+    """将结构数组还原为动作序列，跳过 NaN 项
+
+    给出 keys(每帧原有的键顺序)时按其输出，与逐帧 frame.copy() 的结果一致；
+    原帧中没有的新增项(如新写入的延时)追加在末尾。
+    """
+    frames = []
+    if keys is None:
+        for row, delay in zip(angles.tolist(), delays.tolist()):
+            frame = {servo_id: angle for servo_id, angle in zip(servo_ids, row)
+                     if angle == angle}
+            if delay == delay:
+                frame['delay'] = delay
+            frames.append(frame)
+        return frames
+        
+    for row, delay, frame_keys in zip(angles.tolist(), delays.tolist(), keys):
+        values = dict(zip(servo_ids, row))
+        values['delay'] = delay
+        frame = {key: values[key] for key in frame_keys if values[key] == values[key]}
+        for key, value in values.items():
+            if value == value and key not in frame:
+                frame[key] = value
+        frames.append(frame)
+    return frames
+
+
+def _frame_keys(frames: List[Dict]) -> List[Tuple[str, ...]]:
+    """记录每帧的键顺序，供 _soa_to_frames 还原"""
+    return [tuple(frame) for frame in frames]
+
+
+@lru_cache(maxsize=64)
+def _pair_indices(servo_ids: Tuple[str, ...],
+                  servo_pairs: Tuple[Tuple[str, str], ...]
+                  ) -> Tuple[np.ndarray, np.ndarray, bool]:
+    """将对称舵机对映射为列索引数组，忽略不存在的舵机
+
+    Returns:
+        (第一列索引, 第二列索引, 是否有舵机出现在多个舵机对中)
+    """
+    index = {servo_id: j for j, servo_id in enumerate(servo_ids)}
+    pairs = [(index[servo1], index[servo2]) for servo1, servo2 in servo_pairs
+             if servo1 in index and servo2 in index]
+    idx1 = np.array([j1 for j1, _ in pairs], dtype=np.intp)
+    idx2 = np.array([j2 for _, j2 in pairs], dtype=np.intp)
+    columns = np.concatenate((idx1, idx2))
+    overlapping = len(np.unique(columns)) < len(columns)
+    return idx1, idx2, overlapping
+
+
+def _fill_delays(delays: np.ndarray) -> np.ndarray:
+    """缺失延时使用默认值"""
+    return np.where(np.isnan(delays), DEFAULT_DELAY, delays)
 
 class ActionOptimizer:
     def __init__(self, logger: logging.Logger = None):
@@ -17,35 +79,21 @@ class ActionOptimizer:
             min_delay: 最小延时
             max_velocity: 最大角速度(度/秒)
         """
-        optimized = []
-        prev_frame = None
-        
-        for frame in frames:
-            if prev_frame is None:
-                optimized.append(frame.copy())
-                prev_frame = frame
-                continue
-                
-            # 计算最大角度变化
-            max_angle_change = 0
-            for servo_id, angle in frame.items():
-                if servo_id == 'delay':
-                    continue
-                prev_angle = prev_frame.get(servo_id, angle)
-                angle_change = abs(angle - prev_angle)
-                max_angle_change = max(max_angle_change, angle_change)
-                
-            # 计算所需最小延时
-            required_delay = max_angle_change / max_velocity
-            
-            # 更新延时
-            new_frame = frame.copy()
-            new_frame['delay'] = max(required_delay, min_delay)
-            optimized.append(new_frame)
-            
-            prev_frame = frame
+        if not frames:
+            return []
             
-        return optimized
+        servo_ids, angles, delays = frames_to_arrays(frames, missing_delay=np.nan)
+        keys = _frame_keys(frames)
+        
+        # 计算相邻帧最大角度变化(缺失舵机视为无变化)
+        changes = np.abs(np.diff(angles, axis=0))
+        changes[np.isnan(changes)] = 0.0
+        max_angle_change = changes.max(axis=1, initial=0.0)
+        
+        # 计算所需最小延时并更新
+        delays[1:] = np.maximum(max_angle_change / max_velocity, min_delay)
+        
+        return _soa_to_frames(servo_ids, angles, delays, keys)
         
     def smooth_trajectory(self, frames: List[Dict],
                          window_size: int = 3) -> List[Dict]:
@@ -94,38 +142,10 @@ class ActionOptimizer:
             frames: 动作序列
             max_accel: 最大加速度(度/秒²)
         """
-        optimized = []
-        
-        for i in range(len(frames)):
-            new_frame = frames[i].copy()
-            
-            if i >= 2:
-                for servo_id in new_frame:
-                    if servo_id == 'delay':
-                        continue
-                        
-                    # 获取前两帧的角度
-                    prev_angles = [
-                        frames[i-2].get(servo_id, new_frame[servo_id]),
-                        frames[i-1].get(servo_id, new_frame[servo_id])
-                    ]
-                    
-                    # 计算加速度
-                    dt = frames[i-1].get('delay', 0.02)
-                    accel = (new_frame[servo_id] - 2*prev_angles[1] +
-                            prev_angles[0]) / (dt * dt)
-                    
-                    # 限制加速度
-                    if abs(accel) > max_accel:
-                        # 调整当前角度以限制加速度
-                        direction = 1 if accel > 0 else -1
-                        max_angle = (2*prev_angles[1] - prev_angles[0] +
-                                   direction * max_accel * dt * dt)
-                        new_frame[servo_id] = max_angle
-                        
-            optimized.append(new_frame)
-            
-        return optimized
+        servo_ids, angles, delays = frames_to_arrays(frames, missing_delay=np.nan)
+        out = np.empty_like(angles)
+        self._reduce_jerk_soa(angles, delays, max_accel, out)
+        return _soa_to_frames(servo_ids, out, delays, _frame_keys(frames))
         
     def optimize_energy(self, frames: List[Dict],
                        max_power: float = 100.0) -> List[Dict]:
@@ -138,34 +158,10 @@ class ActionOptimizer:
         Returns:
             优化后的动作序列
         """
-        optimized = []
-        
-        for i in range(len(frames)):
-            frame = frames[i].copy()
-            
-            if i > 0:
-                dt = frames[i-1].get('delay', 0.02)
-                total_power = 0
-                
-                # 计算当前功率
-                for servo_id in frame:
-                    if servo_id == 'delay':
-                        continue
-                        
-                    if servo_id in frames[i-1]:
-                        velocity = abs(frame[servo_id] - 
-                                     frames[i-1][servo_id]) / dt
-                        power = velocity * velocity * 0.1
-                        total_power += power
-                        
-                # 如果超过功率限制，调整延时
-                if total_power > max_power:
-                    scale_factor = np.sqrt(max_power / total_power)
-                    frame['delay'] = dt / scale_factor
-                    
-            optimized.append(frame)
-            
-        return optimized
+        servo_ids, angles, delays = frames_to_arrays(frames, missing_delay=np.nan)
+        out_delays = np.empty_like(delays)
+        self._optimize_energy_soa(angles, delays, max_power, out_delays)
+        return _soa_to_frames(servo_ids, angles, out_delays, _frame_keys(frames))
         
     def optimize_symmetry(self, frames: List[Dict],
                          servo_pairs: Dict[str, str]) -> List[Dict]:
@@ -178,25 +174,10 @@ class ActionOptimizer:
         Returns:
             优化后的动作序列
         """
-        optimized = []
-        
-        for frame in frames:
-            new_frame = frame.copy()
-            
-            for servo1, servo2 in servo_pairs.items():
-                if servo1 in frame and servo2 in frame:
-                    # 计算对称角度
-                    angle1 = frame[servo1]
-                    angle2 = frame[servo2]
-                    avg_angle = (angle1 + angle2) / 2
-                    
-                    # 调整到对称位置
-                    new_frame[servo1] = avg_angle
-                    new_frame[servo2] = avg_angle
-                    
-            optimized.append(new_frame)
-            
-        return optimized
+        servo_ids, angles, delays = frames_to_arrays(frames, missing_delay=np.nan)
+        out = np.empty_like(angles)
+        self._optimize_symmetry_soa(servo_ids, angles, servo_pairs, out)
+        return _soa_to_frames(servo_ids, out, delays, _frame_keys(frames))
         
     def optimize_continuity(self, frames: List[Dict],
                            max_gap: float = 10.0) -> List[Dict]:
@@ -209,34 +190,12 @@ class ActionOptimizer:
         Returns:
             优化后的动作序列
         """
-        optimized = []
-        
-        for i in range(len(frames)):
-            frame = frames[i].copy()
-            
-            if i > 0:
-                prev_frame = optimized[-1]
-                
-                for servo_id in frame:
-                    if servo_id == 'delay':
-                        continue
-                        
-                    if servo_id in prev_frame:
-                        gap = abs(frame[servo_id] - prev_frame[servo_id])
-                        if gap > max_gap:
-                            # 插入过渡帧
-                            steps = int(np.ceil(gap / max_gap))
-                            for j in range(1, steps):
-                                t = j / steps
-                                transition_frame = prev_frame.copy()
-                                transition_frame[servo_id] = prev_frame[servo_id] + \
-                                    t * (frame[servo_id] - prev_frame[servo_id])
-                                transition_frame['delay'] = frame.get('delay', 0.02) / steps
-                                optimized.append(transition_frame)
-                                
-            optimized.append(frame)
-            
-        return optimized
+        servo_ids, angles, delays = frames_to_arrays(frames, missing_delay=np.nan)
+        keys = _frame_keys(frames)
+        angles, delays, sources = self._optimize_continuity_soa(
+            servo_ids, angles, delays, max_gap, keys)
+        return _soa_to_frames(servo_ids, angles, delays,
+                              [keys[source] for source in sources])
         
     def optimize_complexity(self, frames: List[Dict],
                            threshold: float = 5.0) -> List[Dict]:
@@ -249,37 +208,155 @@ class ActionOptimizer:
         Returns:
             优化后的动作序列
         """
-        optimized = []
-        directions = {}
+        servo_ids, angles, delays = frames_to_arrays(frames, missing_delay=np.nan)
+        self._optimize_complexity_soa(angles, threshold)
+        return _soa_to_frames(servo_ids, angles, delays, _frame_keys(frames))
         
-        for i in range(len(frames)):
-            frame = frames[i].copy()
+    def _reduce_jerk_soa(self, angles: np.ndarray, delays: np.ndarray,
+                         max_accel: float, out: np.ndarray):
+        """减少加加速度(结构数组版本)，结果写入 out"""
+        np.copyto(out, angles)
+        if len(angles) < 3:
+            return
             
-            if i > 0:
-                prev_frame = optimized[-1]
-                
-                for servo_id in frame:
-                    if servo_id == 'delay':
+        curr = angles[2:]
+        # 缺失的历史角度以当前角度代替
+        prev2 = np.where(np.isnan(angles[:-2]), curr, angles[:-2])
+        prev1 = np.where(np.isnan(angles[1:-1]), curr, angles[1:-1])
+        dt2 = np.square(_fill_delays(delays[1:-1]))[:, None]
+        
+        accel = (curr - 2 * prev1 + prev2) / dt2
+        with np.errstate(invalid='ignore'):
+            mask = np.abs(accel) > max_accel
+            
+        # 调整当前角度以限制加速度
+        limited = 2 * prev1 - prev2 + np.sign(accel) * max_accel * dt2
+        out[2:][mask] = limited[mask]
+        
+    def _optimize_energy_soa(self, angles: np.ndarray, delays: np.ndarray,
+                             max_power: float, out_delays: np.ndarray):
+        """优化能量消耗(结构数组版本)，结果写入 out_delays"""
+        np.copyto(out_delays, delays)
+        if len(angles) < 2:
+            return
+            
+        # 计算每帧总功率
+        dt = _fill_delays(delays[:-1])
+        velocity = np.abs(np.diff(angles, axis=0)) / dt[:, None]
+        total_power = np.nansum(velocity * velocity * 0.1, axis=1)
+        
+        # 超过功率限制时调整延时
+        mask = total_power > max_power
+        out_delays[1:][mask] = dt[mask] / np.sqrt(max_power / total_power[mask])
+        
+    def _optimize_symmetry_soa(self, servo_ids: List[str], angles: np.ndarray,
+                               servo_pairs: Dict[str, str], out: np.ndarray):
+        """优化对称性(结构数组版本)，结果写入 out"""
+        np.copyto(out, angles)
+        idx1, idx2, overlapping = _pair_indices(tuple(servo_ids), tuple(servo_pairs.items()))
+        if not len(idx1):
+            return
+            
+        # 舵机对有重叠时按顺序逐对写入，后面的舵机对覆盖前面的结果；
+        # 平均值始终取自原始角度
+        if overlapping:
+            for j1, j2 in zip(idx1.tolist(), idx2.tolist()):
+                avg_angle = 0.5 * (angles[:, j1] + angles[:, j2])
+                present = ~np.isnan(avg_angle)
+                out[present, j1] = avg_angle[present]
+                out[present, j2] = avg_angle[present]
+            return
+            
+        # 仅在两个舵机同时存在的帧上取平均
+        angle1 = angles[:, idx1]
+        angle2 = angles[:, idx2]
+        avg_angle = 0.5 * (angle1 + angle2)
+        missing = np.isnan(avg_angle)
+        out[:, idx1] = np.where(missing, angle1, avg_angle)
+        out[:, idx2] = np.where(missing, angle2, avg_angle)
+        
+    def _optimize_continuity_soa(self, servo_ids: List[str], angles: np.ndarray,
+                                 delays: np.ndarray, max_gap: float,
+                                 keys: List[Tuple[str, ...]]
+                                 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """优化连续性(结构数组版本)
+        
+        会插入过渡帧，因此返回新的角度和延时数组，以及每个输出行沿用其键顺序的
+        输入帧索引(过渡帧复制自上一帧，沿用上一帧的键顺序)。同一帧内各舵机的
+        过渡帧按该帧自身的键顺序插入。
+        """
+        if len(angles) < 2:
+            return angles.copy(), delays.copy(), np.arange(len(angles))
+            
+        with np.errstate(invalid='ignore'):
+            gaps = np.abs(np.diff(angles, axis=0))
+            steps = np.ceil(gaps / max_gap)
+            steps[~(gaps > max_gap)] = 1
+            
+        # 每帧之前插入的过渡帧数量
+        extra = (steps - 1).sum(axis=1).astype(int)
+        if not extra.any():
+            return angles.copy(), delays.copy(), np.arange(len(angles))
+            
+        total = len(angles) + int(extra.sum())
+        out_angles = np.empty((total, angles.shape[1]))
+        out_delays = np.empty(total)
+        sources = np.empty(total, dtype=np.intp)
+        index = {servo_id: j for j, servo_id in enumerate(servo_ids)}
+        
+        out_angles[0] = angles[0]
+        out_delays[0] = delays[0]
+        sources[0] = 0
+        pos = 1
+        
+        for i in range(1, len(angles)):
+            prev = angles[i - 1]
+            frame_delay = delays[i] if delays[i] == delays[i] else DEFAULT_DELAY
+            
+            # 插入过渡帧：每个舵机单独从上一帧过渡到当前帧
+            if extra[i - 1]:
+                for key in keys[i]:
+                    j = index.get(key)
+                    if j is None or steps[i - 1, j] <= 1:
                         continue
-                        
-                    if servo_id in prev_frame:
-                        change = frame[servo_id] - prev_frame[servo_id]
-                        curr_dir = np.sign(change)
-                        
-                        # 检查方向变化
-                        if servo_id in directions:
-                            if curr_dir != directions[servo_id] and \
-                               abs(change) < threshold:
-                                # 保持原方向
-                                frame[servo_id] = prev_frame[servo_id]
-                                curr_dir = directions[servo_id]
-                                
-                        directions[servo_id] = curr_dir
-                        
-            optimized.append(frame)
+                    n = int(steps[i - 1, j])
+                    t = np.arange(1, n) / n
+                    out_angles[pos:pos + n - 1] = prev
+                    out_angles[pos:pos + n - 1, j] = prev[j] + t * (angles[i, j] - prev[j])
+                    out_delays[pos:pos + n - 1] = frame_delay / n
+                    sources[pos:pos + n - 1] = i - 1
+                    pos += n - 1
+                    
+            out_angles[pos] = angles[i]
+            out_delays[pos] = delays[i]
+            sources[pos] = i
+            pos += 1
             
-        return optimized
+        return out_angles, out_delays, sources
         
+    def _optimize_complexity_soa(self, angles: np.ndarray, threshold: float):
+        """优化复杂度(结构数组版本)，原地修改 angles"""
+        if len(angles) < 2:
+            return
+            
+        directions = np.zeros(angles.shape[1])
+        has_direction = np.zeros(angles.shape[1], dtype=bool)
+        
+        for i in range(1, len(angles)):
+            change = angles[i] - angles[i - 1]
+            valid = ~np.isnan(change)
+            curr_dir = np.sign(change)
+            
+            # 方向变化且幅度较小时保持原方向
+            with np.errstate(invalid='ignore'):
+                revert = (valid & has_direction & (curr_dir != directions) &
+                          (np.abs(change) < threshold))
+            angles[i, revert] = angles[i - 1, revert]
+            curr_dir[revert] = directions[revert]
+            
+            directions[valid] = curr_dir[valid]
+            has_direction |= valid
+            
     def optimize_all(self, frames: List[Dict],
                     config: Dict = None) -> List[Dict]:
         """应用所有优化
@@ -300,12 +377,20 @@ class ActionOptimizer:
                 'smoothing_factor': 0.1
             }
             
-        # 应用各种优化
-        optimized = frames
-        optimized = self.optimize_energy(optimized, config['max_power'])
-        optimized = self.optimize_symmetry(optimized, config['servo_pairs'])
-        optimized = self.optimize_continuity(optimized, config['max_gap'])
-        optimized = self.optimize_complexity(optimized, config['complexity_threshold'])
+        # 一次性转换为结构数组，在两个缓冲区之间交替执行各项优化
+        servo_ids, buf_a, delays_a = frames_to_arrays(frames, missing_delay=np.nan)
+        keys = _frame_keys(frames)
+        buf_b = np.empty_like(buf_a)
+        delays_b = np.empty_like(delays_a)
+        
+        self._optimize_energy_soa(buf_a, delays_a, config['max_power'], delays_b)
+        self._optimize_symmetry_soa(servo_ids, buf_a, config['servo_pairs'], buf_b)
+        buf_a, delays_a, sources = self._optimize_continuity_soa(
+            servo_ids, buf_b, delays_b, config['max_gap'], keys)
+        self._optimize_complexity_soa(buf_a, config['complexity_threshold'])
+        
+        optimized = _soa_to_frames(servo_ids, buf_a, delays_a,
+                                   [keys[source] for source in sources])
         optimized = self.optimize_trajectory(optimized, config['smoothing_factor'])
         
-        return optimized 
\ No newline at end of file
+        return optimized
@@ -1,9 +1,12 @@
-import tkinter as tk
-from tkinter import ttk
-import yaml
 import os
 from typing import List, Dict
 import logging
+from .frames import frames_to_arrays
+
+# tkinter 和 yaml 在首次使用时才导入，无界面的调用方不承担其导入开销
+
+# 保存序列时的写缓冲区大小
+WRITE_BUFFER_SIZE = 1 << 20
 
 class ActionSequenceEditor:
     def __init__(self, servo_ids: List[str], logger: logging.Logger = None):
@@ -11,11 +14,18 @@ class ActionSequenceEditor:
         self.logger = logger
         self.sequences = []
         self.current_sequence = []
+        self._last_display_rows: List[str] = []
+        self.preview_callback = None
+        self.preview_sequence_callback = None
+        self.preview_array_callback = None
         
         self._create_gui()
         
     def _create_gui(self):
         """创建图形界面"""
+        import tkinter as tk
+        from tkinter import ttk
+        
         self.root = tk.Tk()
         self.root.title("动作序列编辑器")
         
@@ -54,6 +64,9 @@ class ActionSequenceEditor:
         
     def _create_preview_controls(self):
         """创建预览控制区域"""
+        import tkinter as tk
+        from tkinter import ttk
+        
         preview_frame = ttk.LabelFrame(self.root, text="动作预览", padding="5")
         preview_frame.grid(row=3, column=0, sticky=(tk.W, tk.E))
         
@@ -90,16 +103,39 @@ class ActionSequenceEditor:
             self._update_sequence_display()
             
     def _update_sequence_display(self):
-        """更新序列显示"""
-        self.sequence_list.delete(0, tk.END)
-        for i, frame in enumerate(self.current_sequence):
-            self.sequence_list.insert(tk.END, f"Frame {i+1}: {frame}")
+        """更新序列显示
+        
+        只重绘与上次显示不同的行，并用一次 insert 批量写入。
+        """
+        import tkinter as tk
+        
+        rows = [f"Frame {i+1}: {frame}" for i, frame in enumerate(self.current_sequence)]
+        last_rows = self._last_display_rows
+        
+        # 找到第一处不同的行
+        start = 0
+        common = min(len(rows), len(last_rows))
+        while start < common and rows[start] == last_rows[start]:
+            start += 1
+            
+        if start < len(last_rows):
+            self.sequence_list.delete(start, tk.END)
+        if start < len(rows):
+            self.sequence_list.insert(tk.END, *rows[start:])
+            
+        self._last_display_rows = rows
             
     def _save_sequence(self):
         """保存当前序列"""
         if not self.current_sequence:
             return
             
+        import yaml
+        try:
+            from yaml import CSafeDumper as Dumper
+        except ImportError:
+            from yaml import SafeDumper as Dumper
+            
         try:
             # 创建保存目录
             os.makedirs("sequences", exist_ok=True)
@@ -109,8 +145,9 @@ class ActionSequenceEditor:
             file_path = os.path.join("sequences", f"{sequence_name}.yaml")
             
             # 保存到YAML文件
-            with open(file_path, 'w') as f:
-                yaml.dump({sequence_name: self.current_sequence}, f)
+            with open(file_path, 'w', buffering=WRITE_BUFFER_SIZE) as f:
+                yaml.dump({sequence_name: self.current_sequence}, f, Dumper=Dumper,
+                          default_flow_style=None, sort_keys=False)
                 
             self.sequences.append(self.current_sequence)
             self.current_sequence = []
@@ -139,13 +176,28 @@ class ActionSequenceEditor:
             return
         
         speed = self.speed_scale.get()
-        if self.preview_sequence_callback:
+        if self.preview_array_callback:
+            # 一次性转换为结构数组，驱动端可直接按数组下发
+            servo_ids, angles, delays = frames_to_arrays(self.current_sequence)
+            self.preview_array_callback(servo_ids, angles, delays, speed)
+        elif self.preview_sequence_callback:
+            # 旧接口直接接收原始帧列表，无需转换
             self.preview_sequence_callback(self.current_sequence, speed)
         
-    def set_preview_callbacks(self, frame_callback=None, sequence_callback=None):
-        """设置预览回调函数"""
+    def set_preview_callbacks(self, frame_callback=None, sequence_callback=None,
+                              array_sequence_callback=None):
+        """设置预览回调函数
+        
+        Args:
+            frame_callback: 单帧预览回调 callback(frame)
+            sequence_callback: 序列预览回调 callback(frames, speed)(兼容旧接口)
+            array_sequence_callback: 序列预览回调
+                callback(servo_ids, angles[帧数, 舵机数], delays[帧数], speed)，
+                缺失角度为 NaN，优先于 sequence_callback
+        """
         self.preview_callback = frame_callback
         self.preview_sequence_callback = sequence_callback
+        self.preview_array_callback = array_sequence_callback
         
     def run(self):
         """运行编辑器"""
@@ -1,6 +1,83 @@
 from typing import List, Dict, Optional, Tuple
 import numpy as np
 import logging
+from . import _validator_kernels as kernels
+from .frames import frames_to_arrays
+
+__all__ = ['ActionValidator']
+
+# 速度分布直方图的箱数
+VELOCITY_BINS = 10
+
+
+def _collect_issues(mask: np.ndarray, values: np.ndarray, servo_ids: List[str],
+                    issue_type: str, limit, first_frame: int = 0,
+                    servo_limits: Optional[List] = None) -> List[Dict]:
+    """将违规掩码转换为问题列表，仅为违规项构建字典
+    
+    Args:
+        mask: 违规掩码[帧数, 舵机数]
+        values: 对应的数值数组
+        servo_ids: 舵机ID列表
+        issue_type: 问题类型
+        limit: 限制值
+        first_frame: mask 第 0 行对应的帧索引
+        servo_limits: 按舵机列给出的限制值，提供时覆盖 limit
+    """
+    rows, cols = np.nonzero(mask)
+    return _collect_issues_at(rows, cols, values, servo_ids, issue_type, limit,
+                              first_frame, servo_limits)
+
+
+def _collect_issues_at(rows: np.ndarray, cols: np.ndarray, values: np.ndarray,
+                       servo_ids: List[str], issue_type: str, limit,
+                       first_frame: int = 0,
+                       servo_limits: Optional[List] = None) -> List[Dict]:
+    """根据按行主序排列的违规项索引构建问题列表，参数同 _collect_issues"""
+    if not len(rows):
+        return []
+        
+    # np.nonzero 按行主序返回，每帧的违规项是连续的一段
+    frame_rows, starts = np.unique(rows, return_index=True)
+    starts = starts.tolist()
+    ends = starts[1:] + [len(rows)]
+    
+    values = values[rows, cols].tolist()
+    cols = cols.tolist()
+    limits = [limit] * len(servo_ids) if servo_limits is None else servo_limits
+    
+    return [
+        {
+            'frame_index': row + first_frame,
+            'issues': {
+                servo_ids[cols[k]]: {
+                    'type': issue_type,
+                    'value': values[k],
+                    'limit': limits[cols[k]]
+                }
+                for k in range(start, end)
+            }
+        }
+        for row, start, end in zip(frame_rows.tolist(), starts, ends)
+    ]
+
+
+def _build_pair_indices(servo_ids: List[str], servo_pairs: Dict[str, str]
+                        ) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """将对称舵机对映射为列索引
+    
+    Returns:
+        (左侧列索引, 右侧列索引, 舵机对标签)，不存在的舵机对被忽略
+    """
+    index = {servo_id: j for j, servo_id in enumerate(servo_ids)}
+    pairs = [(servo1, servo2) for servo1, servo2 in servo_pairs.items()
+             if servo1 in index and servo2 in index]
+             
+    left_idx = np.array([index[servo1] for servo1, _ in pairs], dtype=np.intp)
+    right_idx = np.array([index[servo2] for _, servo2 in pairs], dtype=np.intp)
+    pair_labels = [f"{servo1}_{servo2}" for servo1, servo2 in pairs]
+    return left_idx, right_idx, pair_labels
+
 
 class ActionValidator:
     def __init__(self, logger: logging.Logger = None):
@@ -10,160 +87,141 @@ class ActionValidator:
         self.max_velocity = 300.0  # 度/秒
         self.max_acceleration = 200.0  # 度/秒²
         
+        # 预计算的限位数组，按 _limit_index 中的序号排列
+        self._limit_index: Dict[str, int] = {}
+        self._min_angles = np.array([-np.inf])
+        self._max_angles = np.array([np.inf])
+        self._limit_tuples: List[Optional[Tuple[float, float]]] = [None]
+        
+        # 构建限位数组时 joint_limits 的内容快照，内容变化（包括原地修改）时重建
+        self._limits_key: Tuple = ()
+        
     def set_joint_limits(self, limits: Dict[str, Tuple[float, float]]):
         """设置关节限位"""
         self.joint_limits = limits
+        self._build_limit_arrays()
+        
+    def _build_limit_arrays(self):
+        """将关节限位预计算为数组，避免逐帧查字典"""
+        self._limit_index = {servo_id: i for i, servo_id in enumerate(self.joint_limits)}
+        self._limit_tuples = [tuple(limit) for limit in self.joint_limits.values()]
+        
+        # 末尾追加 ±inf 哨兵，供无限位的舵机(索引 -1)使用
+        self._min_angles = np.array([limit[0] for limit in self._limit_tuples] + [-np.inf])
+        self._max_angles = np.array([limit[1] for limit in self._limit_tuples] + [np.inf])
+        self._limit_tuples.append(None)
+        self._limits_key = self._current_limits_key()
+        
+    def _current_limits_key(self) -> Tuple:
+        """joint_limits 当前内容的快照"""
+        return tuple((servo_id, tuple(limit))
+                     for servo_id, limit in self.joint_limits.items())
         
     def validate_sequence(self, frames: List[Dict]) -> List[Dict]:
         """验证完整的动作序列
         
+        所有检查共享同一份结构数组，帧数据只读取一次。
+        
         Returns:
             验证问题列表
         """
+        servo_ids, angles, delays = frames_to_arrays(frames)
+        deltas = np.diff(angles, axis=0)
+        
         issues = []
         
         # 验证角度限位
-        angle_issues = self._check_angle_limits(frames)
-        if angle_issues:
-            issues.extend(angle_issues)
-            
+        issues.extend(self._angle_limit_issues(servo_ids, angles))
+        
         # 验证速度限制
-        velocity_issues = self._check_velocity_limits(frames)
-        if velocity_issues:
-            issues.extend(velocity_issues)
-            
+        issues.extend(self._velocity_issues(servo_ids, deltas, delays))
+        
         # 验证加速度限制
-        accel_issues = self._check_acceleration_limits(frames)
-        if accel_issues:
-            issues.extend(accel_issues)
-            
+        issues.extend(self._acceleration_issues(servo_ids, deltas, delays))
+        
         # 验证时序合理性
-        timing_issues = self._check_timing(frames)
-        if timing_issues:
-            issues.extend(timing_issues)
-            
+        issues.extend(self._timing_issues(delays))
+        
         return issues
         
     def _check_angle_limits(self, frames: List[Dict]) -> List[Dict]:
         """检查角度限位"""
-        issues = []
-        
-        for i, frame in enumerate(frames):
-            frame_issues = {}
-            
-            for servo_id, angle in frame.items():
-                if servo_id == 'delay':
-                    continue
-                    
-                if servo_id in self.joint_limits:
-                    min_angle, max_angle = self.joint_limits[servo_id]
-                    if angle < min_angle or angle > max_angle:
-                        frame_issues[servo_id] = {
-                            'type': 'angle_limit',
-                            'value': angle,
-                            'limit': (min_angle, max_angle)
-                        }
-                        
-            if frame_issues:
-                issues.append({
-                    'frame_index': i,
-                    'issues': frame_issues
-                })
-                
-        return issues
+        servo_ids, angles, _ = frames_to_arrays(frames)
+        return self._angle_limit_issues(servo_ids, angles)
         
     def _check_velocity_limits(self, frames: List[Dict]) -> List[Dict]:
         """检查速度限制"""
-        issues = []
-        
-        for i in range(1, len(frames)):
-            frame_issues = {}
-            dt = frames[i-1].get('delay', 0.02)
-            
-            for servo_id in frames[i]:
-                if servo_id == 'delay':
-                    continue
-                    
-                if servo_id in frames[i-1]:
-                    velocity = abs(frames[i][servo_id] - 
-                                 frames[i-1][servo_id]) / dt
-                    
-                    if velocity > self.max_velocity:
-                        frame_issues[servo_id] = {
-                            'type': 'velocity_limit',
-                            'value': velocity,
-                            'limit': self.max_velocity
-                        }
-                        
-            if frame_issues:
-                issues.append({
-                    'frame_index': i,
-                    'issues': frame_issues
-                })
-                
-        return issues
+        servo_ids, angles, delays = frames_to_arrays(frames)
+        return self._velocity_issues(servo_ids, np.diff(angles, axis=0), delays)
         
     def _check_acceleration_limits(self, frames: List[Dict]) -> List[Dict]:
         """检查加速度限制"""
-        issues = []
-        
-        for i in range(2, len(frames)):
-            frame_issues = {}
-            dt = frames[i-1].get('delay', 0.02)
-            
-            for servo_id in frames[i]:
-                if servo_id == 'delay':
-                    continue
-                    
-                if servo_id in frames[i-1] and servo_id in frames[i-2]:
-                    accel = abs(frames[i][servo_id] - 2*frames[i-1][servo_id] +
-                              frames[i-2][servo_id]) / (dt * dt)
-                    
-                    if accel > self.max_acceleration:
-                        frame_issues[servo_id] = {
-                            'type': 'acceleration_limit',
-                            'value': accel,
-                            'limit': self.max_acceleration
-                        }
-                        
-            if frame_issues:
-                issues.append({
-                    'frame_index': i,
-                    'issues': frame_issues
-                })
-                
-        return issues
+        servo_ids, angles, delays = frames_to_arrays(frames)
+        return self._acceleration_issues(servo_ids, np.diff(angles, axis=0), delays)
         
     def _check_timing(self, frames: List[Dict]) -> List[Dict]:
         """检查时序合理性"""
-        issues = []
+        _, _, delays = frames_to_arrays(frames)
+        return self._timing_issues(delays)
         
-        for i, frame in enumerate(frames):
-            frame_issues = {}
+    def _angle_limit_issues(self, servo_ids: List[str],
+                            angles: np.ndarray) -> List[Dict]:
+        """角度限位检查(结构数组版本)"""
+        if self._current_limits_key() != self._limits_key:
+            self._build_limit_arrays()
             
-            # 检查延时是否合理
-            if 'delay' in frame:
-                delay = frame['delay']
-                if delay < 0.01:  # 最小延时
-                    frame_issues['delay'] = {
-                        'type': 'timing_too_short',
-                        'value': delay,
-                        'limit': 0.01
-                    }
-                elif delay > 5.0:  # 最大延时
-                    frame_issues['delay'] = {
-                        'type': 'timing_too_long',
-                        'value': delay,
-                        'limit': 5.0
-                    }
-                    
-            if frame_issues:
-                issues.append({
-                    'frame_index': i,
-                    'issues': frame_issues
-                })
-                
-        return issues
+        # 无限位的舵机映射到 ±inf 哨兵，比较结果恒为 False
+        columns = [self._limit_index.get(servo_id, -1) for servo_id in servo_ids]
+        min_angles = self._min_angles[columns]
+        max_angles = self._max_angles[columns]
+        limits = [self._limit_tuples[c] for c in columns]
+        
+        if kernels.AVAILABLE:
+            rows, cols = kernels.find_limit_violations(angles, min_angles, max_angles)
+        else:
+            rows, cols = np.nonzero((angles < min_angles) | (angles > max_angles))
+            
+        return _collect_issues_at(rows, cols, angles, servo_ids, 'angle_limit', None,
+                                  servo_limits=limits)
+                               
+    def _velocity_issues(self, servo_ids: List[str], deltas: np.ndarray,
+                         delays: np.ndarray) -> List[Dict]:
+        """速度限制检查(结构数组版本)"""
+        velocities = np.abs(deltas)
+        velocities /= delays[:-1, None]
+        return _collect_issues(velocities > self.max_velocity, velocities,
+                               servo_ids, 'velocity_limit', self.max_velocity, 1)
+                               
+    def _acceleration_issues(self, servo_ids: List[str], deltas: np.ndarray,
+                             delays: np.ndarray) -> List[Dict]:
+        """加速度限制检查(结构数组版本)"""
+        # 二阶中心差分，原地取绝对值并除以 dt²，避免额外的临时数组
+        accels = np.diff(deltas, axis=0)
+        np.abs(accels, out=accels)
+        dt = delays[1:-1]
+        accels /= np.multiply(dt, dt)[:, None]
+        return _collect_issues(accels > self.max_acceleration, accels,
+                               servo_ids, 'acceleration_limit',
+                               self.max_acceleration, 2)
+                               
+    def _timing_issues(self, delays: np.ndarray) -> List[Dict]:
+        """时序合理性检查(结构数组版本)
+        
+        未设置延时的帧使用默认延时，不会触发问题。
+        """
+        # 最小延时 0.01，最大延时 5.0
+        bad = np.flatnonzero((delays < 0.01) | (delays > 5.0))
+        return [
+            {
+                'frame_index': i,
+                'issues': {
+                    'delay': {'type': 'timing_too_short', 'value': delay, 'limit': 0.01}
+                    if delay < 0.01 else
+                    {'type': 'timing_too_long', 'value': delay, 'limit': 5.0}
+                }
+            }
+            for i, delay in zip(bad.tolist(), delays[bad].tolist())
+        ]
         
     def validate_continuity(self, frames: List[Dict],
                            max_gap: float = 10.0) -> List[Dict]:
@@ -176,31 +234,11 @@ class ActionValidator:
         Returns:
             连续性问题列表
         """
-        issues = []
+        servo_ids, angles, _ = frames_to_arrays(frames)
+        gaps = np.abs(np.diff(angles, axis=0))
         
-        for i in range(1, len(frames)):
-            frame_issues = {}
-            
-            for servo_id in frames[i]:
-                if servo_id == 'delay':
-                    continue
-                    
-                if servo_id in frames[i-1]:
-                    gap = abs(frames[i][servo_id] - frames[i-1][servo_id])
-                    if gap > max_gap:
-                        frame_issues[servo_id] = {
-                            'type': 'continuity_gap',
-                            'value': gap,
-                            'limit': max_gap
-                        }
-                        
-            if frame_issues:
-                issues.append({
-                    'frame_index': i,
-                    'issues': frame_issues
-                })
-                
-        return issues
+        return _collect_issues(gaps > max_gap, gaps, servo_ids,
+                               'continuity_gap', max_gap, 1)
         
     def validate_symmetry(self, frames: List[Dict],
                          servo_pairs: Dict[str, str],
@@ -215,29 +253,14 @@ class ActionValidator:
         Returns:
             对称性问题列表
         """
-        issues = []
+        servo_ids, angles, _ = frames_to_arrays(frames)
+        left_idx, right_idx, pair_labels = _build_pair_indices(servo_ids, servo_pairs)
         
-        for i, frame in enumerate(frames):
-            frame_issues = {}
-            
-            for servo1, servo2 in servo_pairs.items():
-                if servo1 in frame and servo2 in frame:
-                    # 计算对称差异
-                    diff = abs(frame[servo1] - frame[servo2])
-                    if diff > max_diff:
-                        frame_issues[f"{servo1}_{servo2}"] = {
-                            'type': 'symmetry_violation',
-                            'value': diff,
-                            'limit': max_diff
-                        }
-                        
-            if frame_issues:
-                issues.append({
-                    'frame_index': i,
-                    'issues': frame_issues
-                })
-                
-        return issues
+        # 计算对称差异(任一舵机缺失时为 NaN，不会触发问题)
+        diffs = np.abs(angles[:, left_idx] - angles[:, right_idx])
+        
+        return _collect_issues(diffs > max_diff, diffs, pair_labels,
+                               'symmetry_violation', max_diff)
         
     def validate_energy(self, frames: List[Dict],
                        max_power: float = 100.0) -> List[Dict]:
@@ -250,39 +273,26 @@ class ActionValidator:
         Returns:
             能量问题列表
         """
-        issues = []
+        servo_ids, angles, delays = frames_to_arrays(frames)
+        velocities = np.abs(np.diff(angles, axis=0)) / delays[:-1, None]
         
-        for i in range(1, len(frames)):
-            frame_issues = {}
-            dt = frames[i-1].get('delay', 0.02)
-            
-            total_power = 0
-            for servo_id in frames[i]:
-                if servo_id == 'delay':
-                    continue
-                    
-                if servo_id in frames[i-1]:
-                    # 计算角速度
-                    velocity = abs(frames[i][servo_id] - 
-                                 frames[i-1][servo_id]) / dt
-                    # 简化的功率模型
-                    power = velocity * velocity * 0.1  # 假设系数
-                    total_power += power
-                    
-            if total_power > max_power:
-                frame_issues['total'] = {
-                    'type': 'power_limit',
-                    'value': total_power,
-                    'limit': max_power
+        # 简化的功率模型
+        total_power = np.nansum(velocities * velocities * 0.1, axis=1)  # 假设系数
+        bad = np.flatnonzero(total_power > max_power)
+        
+        return [
+            {
+                'frame_index': i + 1,
+                'issues': {
+                    'total': {
+                        'type': 'power_limit',
+                        'value': power,
+                        'limit': max_power
+                    }
                 }
-                
-            if frame_issues:
-                issues.append({
-                    'frame_index': i,
-                    'issues': frame_issues
-                })
-                
-        return issues
+            }
+            for i, power in zip(bad.tolist(), total_power[bad].tolist())
+        ]
         
     def suggest_improvements(self, frames: List[Dict]) -> List[Dict]:
         """提供动作改进建议
@@ -323,47 +333,47 @@ class ActionValidator:
         
     def _analyze_velocities(self, frames: List[Dict]) -> Dict:
         """分析速度分布"""
-        velocities = []
-        
-        for i in range(1, len(frames)):
-            dt = frames[i-1].get('delay', 0.02)
-            for servo_id in frames[i]:
-                if servo_id == 'delay':
-                    continue
-                if servo_id in frames[i-1]:
-                    velocity = abs(frames[i][servo_id] - 
-                                 frames[i-1][servo_id]) / dt
-                    velocities.append(velocity)
-                    
+        servo_ids, angles, delays = frames_to_arrays(frames)
+        if kernels.AVAILABLE:
+            velocities = kernels.analyze_velocities(angles, delays)
+        else:
+            velocities = np.abs(np.diff(angles, axis=0)) / delays[:-1, None]
+            velocities = velocities[~np.isnan(velocities)]
+            
+        max_velocity = float(velocities.max())
+        
+        # 单次求和计算均值和标准差
+        count = velocities.size
+        mean = velocities.sum() / count
+        variance = np.dot(velocities, velocities) / count - mean * mean
+        
+        # 在 [0, max_velocity) 上等宽分箱，超限速度计入最后一箱
+        bins = (velocities * (VELOCITY_BINS / self.max_velocity)).astype(np.intp)
+        np.clip(bins, 0, VELOCITY_BINS - 1, out=bins)
+        
         return {
-            'mean': np.mean(velocities),
-            'std': np.std(velocities),
-            'max': max(velocities),
-            'distribution': np.histogram(velocities)[0].tolist()
+            'mean': mean,
+            'std': np.sqrt(max(variance, 0.0)),
+            'max': max_velocity,
+            'distribution': np.bincount(bins, minlength=VELOCITY_BINS).tolist()
         }
         
     def _analyze_energy(self, frames: List[Dict]) -> Dict:
         """分析能量消耗"""
-        energy_peaks = 0
-        total_energy = 0
-        
-        for i in range(1, len(frames)):
-            dt = frames[i-1].get('delay', 0.02)
-            frame_energy = 0
+        servo_ids, angles, delays = frames_to_arrays(frames)
+        if kernels.AVAILABLE:
+            total_energy, energy_peaks = kernels.analyze_energy(angles, delays)
+        else:
+            dt = delays[:-1]
+            velocities = np.abs(np.diff(angles, axis=0)) / dt[:, None]
+            frame_energy = np.nansum(velocities * velocities, axis=1) * dt
             
-            for servo_id in frames[i]:
-                if servo_id == 'delay':
-                    continue
-                if servo_id in frames[i-1]:
-                    velocity = abs(frames[i][servo_id] - 
-                                 frames[i-1][servo_id]) / dt
-                    energy = velocity * velocity * dt
-                    frame_energy += energy
-                    
-            total_energy += frame_energy
-            if frame_energy > total_energy / len(frames) * 2:
-                energy_peaks += 1
-                
+            # 能量峰值：超过当前累计平均能量两倍的帧
+            cumulative = np.cumsum(frame_energy)
+            energy_peaks = int(np.count_nonzero(
+                frame_energy > cumulative / len(frames) * 2))
+            total_energy = float(cumulative[-1]) if len(cumulative) else 0
+        
         return {
             'total': total_energy,
             'peaks': energy_peaks,
@@ -372,21 +382,18 @@ class ActionValidator:
         
     def _analyze_complexity(self, frames: List[Dict]) -> Dict:
         """分析动作复杂度"""
-        changes = 0
-        directions = {}
-        
-        for i in range(1, len(frames)):
-            for servo_id in frames[i]:
-                if servo_id == 'delay':
-                    continue
-                if servo_id in frames[i-1]:
-                    curr_dir = np.sign(frames[i][servo_id] - 
-                                     frames[i-1][servo_id])
-                    if servo_id in directions:
-                        if curr_dir != directions[servo_id]:
-                            changes += 1
-                    directions[servo_id] = curr_dir
-                    
+        servo_ids, angles, _ = frames_to_arrays(frames)
+        if kernels.AVAILABLE:
+            changes = kernels.analyze_complexity(angles)
+        else:
+            directions = np.sign(np.diff(angles, axis=0))
+            changes = 0
+            for j in range(directions.shape[1]):
+                # 每个舵机有效方向序列中相邻元素不同的次数
+                column = directions[:, j]
+                column = column[~np.isnan(column)]
+                changes += int(np.count_nonzero(column[1:] != column[:-1]))
+                
         return {
             'changes': changes,
             'change_rate': changes / len(frames)
@@ -1,11 +1,50 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Mapping
 import yaml
 import json
 import os
 import logging
+import copy
 from dataclasses import dataclass
+from types import MappingProxyType
 
-@dataclass
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
+try:
+    import orjson
+    _ORJSON_OPTIONS = (orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS |
+                       orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    orjson = None
+
+# 超过该大小(字节)的 YAML 配置建议通过 convert_to_json 转为 JSON 格式
+SIZE_THRESHOLD = 128 * 1024
+
+# 读取配置文件时的缓冲区大小
+READ_BUFFER_SIZE = 1 << 20
+
+def _json_loads(data: bytes) -> Any:
+    """解析 JSON，优先使用 orjson"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_default(obj: Any) -> Any:
+    """标准库 json 的兜底序列化，支持 NumPy 数组和标量"""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"无法序列化类型: {type(obj).__name__}")
+
+def _json_dumps(data: Any) -> bytes:
+    """序列化 JSON，优先使用 orjson(可直接序列化 NumPy 数组)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=_ORJSON_OPTIONS)
+    return json.dumps(data, indent=4, ensure_ascii=False,
+                      default=_json_default).encode('utf-8')
+
+@dataclass(slots=True)
 class RobotConfig:
     """机器人配置"""
     # 网络配置
@@ -30,30 +69,51 @@ class ConfigManager:
         self.logger = logger or logging.getLogger('ConfigManager')
         self.config_path = config_path or 'config/robot_config.yaml'
         self.config = RobotConfig()
+        # 最近一次读取/写入的文件标识 (路径, mtime_ns, 大小) 及其解析结果
+        self._file_stamp = None
+        self._file_data: Optional[Dict] = None
+        
+    def _stat_stamp(self) -> tuple:
+        """获取配置文件标识"""
+        st = os.stat(self.config_path)
+        return (self.config_path, st.st_mtime_ns, st.st_size)
         
     def load_config(self) -> bool:
-        """加载配置"""
+        """加载配置
+        
+        文件自上次加载/保存后未变化时不再解析，直接将缓存的解析结果
+        复制后重新应用到内存配置，与重新读取文件的效果一致。
+        """
         try:
             # 检查文件是否存在
-            if not os.path.exists(self.config_path):
+            try:
+                stamp = self._stat_stamp()
+            except FileNotFoundError:
                 self.logger.error(f"配置文件不存在: {self.config_path}")
                 return False
                 
+            if stamp == self._file_stamp:
+                self.logger.debug("配置文件未变化，使用缓存的解析结果")
+                self._apply_config_data(copy.deepcopy(self._file_data))
+                return True
+                
             # 读取配置文件
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                if self.config_path.endswith('.yaml'):
-                    config_data = yaml.safe_load(f)
-                elif self.config_path.endswith('.json'):
-                    config_data = json.load(f)
-                else:
-                    self.logger.error("不支持的配置文件格式")
-                    return False
-                    
-            # 更新配置
-            for key, value in config_data.items():
-                if hasattr(self.config, key):
-                    setattr(self.config, key, value)
-                    
+            if self.config_path.endswith('.yaml'):
+                if stamp[2] > SIZE_THRESHOLD:
+                    self.logger.debug(f"配置文件较大，建议转换为JSON格式: {self.config_path}")
+                with open(self.config_path, 'rb', buffering=READ_BUFFER_SIZE) as f:
+                    config_data = yaml.load(f, Loader=_Loader)
+            elif self.config_path.endswith('.json'):
+                with open(self.config_path, 'rb') as f:
+                    config_data = _json_loads(f.read())
+            else:
+                self.logger.error("不支持的配置文件格式")
+                return False
+                
+            # 缓存解析结果，内存配置使用其副本
+            self._file_data = config_data
+            self._file_stamp = stamp
+            self._apply_config_data(copy.deepcopy(config_data))
             self.logger.info("配置加载完成")
             return True
             
@@ -61,23 +121,32 @@ class ConfigManager:
             self.logger.error(f"加载配置失败: {str(e)}")
             return False
             
+    def _apply_config_data(self, config_data: Dict):
+        """将配置数据写入内存配置"""
+        for key, value in config_data.items():
+            if hasattr(self.config, key):
+                setattr(self.config, key, value)
+                
     def save_config(self) -> bool:
         """保存配置"""
         try:
             # 转换为字典
-            config_data = {
-                key: value
-                for key, value in self.config.__dict__.items()
-                if value is not None
-            }
+            config_data = {}
+            for name in self.config.__slots__:
+                value = getattr(self.config, name)
+                if value is not None:
+                    config_data[name] = value
             
             # 保存配置文件
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                if self.config_path.endswith('.yaml'):
-                    yaml.safe_dump(config_data, f, allow_unicode=True)
-                elif self.config_path.endswith('.json'):
-                    json.dump(config_data, f, indent=4, ensure_ascii=False)
+            if self.config_path.endswith('.yaml'):
+                with open(self.config_path, 'w', encoding='utf-8') as f:
+                    yaml.dump(config_data, f, Dumper=_Dumper, allow_unicode=True)
+            elif self.config_path.endswith('.json'):
+                with open(self.config_path, 'wb') as f:
+                    f.write(_json_dumps(config_data))
                     
+            self._file_data = copy.deepcopy(config_data)
+            self._file_stamp = self._stat_stamp()
             self.logger.info("配置保存完成")
             return True
             
@@ -85,6 +154,38 @@ class ConfigManager:
             self.logger.error(f"保存配置失败: {str(e)}")
             return False
             
+    def convert_to_json(self, json_path: str = None) -> bool:
+        """将 YAML 配置转换为 JSON 格式
+        
+        JSON 解析速度明显快于 YAML，适用于超过 SIZE_THRESHOLD 的大型配置。
+        转换成功后 config_path 指向新的 JSON 文件。
+        
+        Args:
+            json_path: JSON 文件路径，默认与原文件同名
+            
+        Returns:
+            是否转换成功
+        """
+        try:
+            if not self.config_path.endswith('.yaml'):
+                self.logger.error(f"仅支持转换YAML配置: {self.config_path}")
+                return False
+                
+            with open(self.config_path, 'r', encoding='utf-8') as f:
+                config_data = yaml.load(f, Loader=_Loader)
+                
+            json_path = json_path or os.path.splitext(self.config_path)[0] + '.json'
+            with open(json_path, 'wb') as f:
+                f.write(_json_dumps(config_data))
+                
+            self.config_path = json_path
+            self.logger.info(f"配置已转换为JSON: {json_path}")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"转换配置失败: {str(e)}")
+            return False
+            
     def get_config(self, section: str = None) -> Dict:
         """获取配置
         
@@ -96,7 +197,23 @@ class ConfigManager:
         """
         if section:
             return getattr(self.config, section, {}) or {}
-        return self.config.__dict__
+        return {name: getattr(self.config, name) for name in self.config.__slots__}
+        
+    def get_config_view(self, section: str = None) -> Mapping:
+        """获取只读配置视图，不复制配置段
+        
+        Args:
+            section: 配置段名称
+            
+        Returns:
+            只读配置视图。已设置的配置段随 update_config 的原地更新而变化；
+            未设置的配置段返回空视图，不指定配置段时返回当前各段的快照，
+            二者都不会反映之后的更新
+        """
+        if section:
+            return MappingProxyType(getattr(self.config, section, None) or {})
+        return MappingProxyType({name: getattr(self.config, name)
+                                 for name in self.config.__slots__})
         
     def update_config(self, section: str, config: Dict) -> bool:
         """更新配置
@@ -113,10 +230,13 @@ class ConfigManager:
                 self.logger.error(f"配置段不存在: {section}")
                 return False
                 
-            current = getattr(self.config, section) or {}
-            current.update(config)
-            setattr(self.config, section, current)
-            
+            # 配置段字典原地更新，仅在尚未设置时创建
+            current = getattr(self.config, section)
+            if current is None:
+                setattr(self.config, section, dict(config))
+            else:
+                current.update(config)
+                
             return True
             
         except Exception as e:
@@ -1,13 +1,109 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator
 import yaml
 import json
 import os
+import copy
+import hashlib
+import mmap
 import logging
-from datetime import datetime
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
+from functools import lru_cache, cached_property
+from types import MappingProxyType
+from ipaddress import ip_network
 from .version_manager import ConfigVersionManager
 
-@dataclass
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
+# CPU核心数，运行期间不变
+_CPU_COUNT = os.cpu_count() or 1
+
+# 配置文件写入缓冲区大小
+WRITE_BUFFER_SIZE = 1 << 20
+
+# YAML输出选项：保持字段顺序，不转义中文，加宽行宽避免折行
+_YAML_DUMP_OPTIONS = {
+    'default_flow_style': False,
+    'sort_keys': False,
+    'allow_unicode': True,
+    'width': 4096
+}
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+@lru_cache(maxsize=1024)
+def _valid_ip(ip: str) -> bool:
+    """验证IP地址或网段格式，按地址缓存结果"""
+    try:
+        ip_network(ip, strict=False)
+    except ValueError:
+        return False
+    return True
+
+def _config_digest(config_data: Dict) -> str:
+    """计算配置内容摘要，用于判断配置是否变化"""
+    if orjson is not None:
+        data = orjson.dumps(config_data,
+                            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(config_data, sort_keys=True).encode('utf-8')
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def _dump_json(config_data: Dict) -> str:
+    """导出为JSON字符串"""
+    if orjson is not None:
+        return orjson.dumps(config_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(config_data, indent=2)
+
+def _dump_yaml(config_data: Dict) -> str:
+    """导出为YAML字符串"""
+    return yaml.dump(config_data, Dumper=_Dumper, **_YAML_DUMP_OPTIONS)
+
+# 导出格式分派表，未知格式按YAML导出
+_EXPORTERS = {
+    'json': _dump_json,
+    'yaml': _dump_yaml
+}
+
+def _freeze(data: Any) -> Any:
+    """将解析结果转换为不可变结构，供缓存共享"""
+    if isinstance(data, dict):
+        return MappingProxyType({key: _freeze(value) for key, value in data.items()})
+    if isinstance(data, list):
+        return tuple(_freeze(item) for item in data)
+    return data
+
+def _thaw(data: Any) -> Any:
+    """从缓存的不可变结构复制出可修改的配置数据"""
+    if isinstance(data, MappingProxyType):
+        return {key: _thaw(value) for key, value in data.items()}
+    if isinstance(data, tuple):
+        return [_thaw(item) for item in data]
+    return data
+
+@lru_cache(maxsize=64)
+def _parse_yaml_cached(path: str, mtime_ns: int, size: int, inode: int = 0) -> Any:
+    """解析 YAML 配置文件，按 (路径, mtime, 大小, inode) 缓存
+    
+    文件被修改后 mtime/大小变化，自然失效；save_config 通过 os.replace
+    原子替换文件，inode 随之改变，即使文件系统时间戳精度较粗也不会
+    命中旧结果。命中情况见 cache_info()。
+    """
+    if size == 0:
+        return None
+        
+    # 直接映射文件页交给 libyaml 解析，省去逐块读取的拷贝
+    with open(path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return _freeze(yaml.load(mm, Loader=_Loader))
+
+@dataclass(slots=True)
 class ServoConfig:
     """舵机配置"""
     id: str
@@ -19,7 +115,7 @@ class ServoConfig:
     offset: float = 0.0
     calibration: Dict[float, float] = field(default_factory=dict)
 
-@dataclass
+@dataclass(slots=True)
 class ActionConfig:
     """动作配置"""
     max_velocity: float = 300.0
@@ -28,7 +124,7 @@ class ActionConfig:
     smoothing_factor: float = 0.1
     servo_pairs: Dict[str, str] = field(default_factory=dict)
 
-@dataclass
+@dataclass(slots=True)
 class SystemConfig:
     """系统配置"""
     log_level: str = 'INFO'
@@ -38,7 +134,7 @@ class SystemConfig:
     enable_remote: bool = False
     remote_port: int = 8080
 
-@dataclass
+@dataclass(slots=True)
 class NetworkConfig:
     """网络配置"""
     host: str = '0.0.0.0'
@@ -50,7 +146,7 @@ class NetworkConfig:
     timeout: float = 30.0
     retry_interval: float = 5.0
 
-@dataclass
+@dataclass(slots=True)
 class SecurityConfig:
     """安全配置"""
     enable_auth: bool = True
@@ -60,7 +156,7 @@ class SecurityConfig:
     allowed_ips: List[str] = field(default_factory=list)
     admin_users: List[str] = field(default_factory=list)
 
-@dataclass
+@dataclass(slots=True)
 class PerformanceConfig:
     """性能配置"""
     max_threads: int = 4
@@ -70,6 +166,138 @@ class PerformanceConfig:
     enable_gpu: bool = False
     profile_enabled: bool = False
 
+def _field_names(cls, exclude: tuple = ()) -> tuple:
+    """按声明顺序返回数据类的字段名"""
+    return tuple(f.name for f in fields(cls) if f.name not in exclude)
+
+# 舵机配置导出字段（id 作为外层键，不重复写入）
+_SERVO_KEYS = _field_names(ServoConfig, exclude=('id',))
+_SERVO_GET = attrgetter(*_SERVO_KEYS)
+
+# 配置段名 -> 数据类，按输出顺序排列
+_SECTION_TYPES = {
+    'action': ActionConfig,
+    'system': SystemConfig,
+    'network': NetworkConfig,
+    'security': SecurityConfig,
+    'performance': PerformanceConfig
+}
+_EMPTY_SECTION = MappingProxyType({})
+
+# 各配置段的导出字段
+_SECTION_KEYS = {
+    name: _field_names(cls) for name, cls in _SECTION_TYPES.items()
+}
+_SECTION_FIELDS = {
+    name: attrgetter(*keys) for name, keys in _SECTION_KEYS.items()
+}
+
+# 健康检查要求舵机配置具备的字段
+_REQUIRED_SERVO_FIELDS = ('min_angle', 'max_angle', 'default_speed')
+
+# 可更新字段集合，update_* 中以集合查找代替 hasattr
+_SERVO_FIELD_SET = frozenset(_field_names(ServoConfig))
+_SECTION_FIELD_SETS = {
+    name: frozenset(keys) for name, keys in _SECTION_KEYS.items()
+}
+
+def _apply_updates(obj: Any, names: frozenset, updates: Dict[str, Any]):
+    """将 updates 中属于 names 的字段写入 obj，忽略未知字段"""
+    for key in names.intersection(updates):
+        setattr(obj, key, updates[key])
+
+# 旧版舵机字段名 -> 新字段名
+_SERVO_FIELD_MIGRATION = (
+    ('min_pos', 'min_angle'),
+    ('max_pos', 'max_angle'),
+    ('speed', 'default_speed')
+)
+
+# 配置模板，模块加载时构建一次并冻结，应用时再复制
+_MINIMAL_TEMPLATE = _freeze({
+    'servos': {},
+    'action': {
+        'max_velocity': 200.0,
+        'min_delay': 0.02,
+        'interpolation': 'linear',
+        'smoothing_factor': 0.1
+    },
+    'system': {
+        'log_level': 'INFO',
+        'data_dir': 'data'
+    }
+})
+
+_STANDARD_TEMPLATE = _freeze({
+    'servos': {
+        'servo1': {
+            'min_angle': -90,
+            'max_angle': 90,
+            'default_speed': 100,
+            'acceleration': 200
+        }
+    },
+    'action': {
+        'max_velocity': 300.0,
+        'min_delay': 0.02,
+        'interpolation': 'cubic',
+        'smoothing_factor': 0.2,
+        'servo_pairs': {
+            'left_arm': 'right_arm'
+        }
+    },
+    'system': {
+        'log_level': 'INFO',
+        'data_dir': 'data',
+        'backup_interval': 3600,
+        'max_backup_count': 10
+    },
+    'network': {
+        'host': '0.0.0.0',
+        'port': 8080,
+        'ssl_enabled': False
+    },
+    'security': {
+        'enable_auth': True,
+        'token_expire': 3600,
+        'allowed_ips': ['127.0.0.1']
+    }
+})
+
+_ADVANCED_TEMPLATE = _freeze({
+    **_thaw(_STANDARD_TEMPLATE),
+    'performance': {
+        'max_threads': 8,
+        'queue_size': 200,
+        'cache_size': 2000,
+        'batch_size': 64,
+        'enable_gpu': True,
+        'profile_enabled': True
+    },
+    'network': {
+        'host': '0.0.0.0',
+        'port': 8443,
+        'ssl_enabled': True,
+        'ssl_cert': 'certs/server.crt',
+        'ssl_key': 'certs/server.key',
+        'max_connections': 20
+    },
+    'security': {
+        'enable_auth': True,
+        'token_expire': 7200,
+        'max_attempts': 5,
+        'lockout_time': 600,
+        'allowed_ips': ['127.0.0.1', '192.168.1.0/24'],
+        'admin_users': ['admin']
+    }
+})
+
+_TEMPLATES = MappingProxyType({
+    'minimal': _MINIMAL_TEMPLATE,
+    'standard': _STANDARD_TEMPLATE,
+    'advanced': _ADVANCED_TEMPLATE
+})
+
 class RobotConfig:
     def __init__(self, config_dir: str = 'config'):
         """机器人配置管理器
@@ -78,8 +306,12 @@ class RobotConfig:
             config_dir: 配置文件目录
         """
         self.config_dir = config_dir
+        self._config_path = os.path.join(config_dir, 'config.yaml')
         self.logger = logging.getLogger('RobotConfig')
-        self.version_manager = ConfigVersionManager(config_dir)
+        
+        # 最近一次保存版本的内容摘要
+        self._last_saved_digest: Optional[str] = None
+        self._last_saved_version_id: Optional[str] = None
         
         # 创建配置目录
         os.makedirs(config_dir, exist_ok=True)
@@ -92,16 +324,19 @@ class RobotConfig:
         self.security = SecurityConfig()
         self.performance = PerformanceConfig()
         
-        # 配置模板
-        self.templates = {
-            'minimal': self._get_minimal_template(),
-            'standard': self._get_standard_template(),
-            'advanced': self._get_advanced_template()
-        }
-        
         # 加载配置
         self.load_config()
         
+    @cached_property
+    def templates(self) -> Dict[str, Dict]:
+        """配置模板，首次访问时从内置模板复制出本实例可修改的副本"""
+        return _thaw(_TEMPLATES)
+        
+    @cached_property
+    def version_manager(self) -> ConfigVersionManager:
+        """配置版本管理器，首次使用时创建"""
+        return ConfigVersionManager(self.config_dir)
+        
     def load_config(self, version: Optional[str] = None):
         """加载配置
         
@@ -110,92 +345,61 @@ class RobotConfig:
         """
         if version:
             config_data = self.version_manager.load_version(version)
+            self._last_saved_digest = None
         else:
-            config_file = os.path.join(self.config_dir, 'config.yaml')
-            if os.path.exists(config_file):
-                with open(config_file, 'r') as f:
-                    config_data = yaml.safe_load(f)
-            else:
+            config_file = self._config_path
+            try:
+                st = os.stat(config_file)
+            except FileNotFoundError:
                 config_data = self._get_default_config()
+            else:
+                config_data = _thaw(_parse_yaml_cached(
+                    config_file, st.st_mtime_ns, st.st_size, st.st_ino))
                 
         self._parse_config(config_data)
         
     def save_config(self, version_name: Optional[str] = None,
-                   comment: str = ''):
+                   comment: str = '') -> Optional[str]:
         """保存配置
         
         Args:
             version_name: 版本名称
             comment: 版本说明
+            
+        Returns:
+            版本ID，未保存版本时返回None
         """
-        config_data = {
-            'servos': {
-                servo_id: {
-                    'min_angle': servo.min_angle,
-                    'max_angle': servo.max_angle,
-                    'default_speed': servo.default_speed,
-                    'acceleration': servo.acceleration,
-                    'inverse': servo.inverse,
-                    'offset': servo.offset,
-                    'calibration': servo.calibration
-                }
-                for servo_id, servo in self.servos.items()
-            },
-            'action': {
-                'max_velocity': self.action.max_velocity,
-                'min_delay': self.action.min_delay,
-                'interpolation': self.action.interpolation,
-                'smoothing_factor': self.action.smoothing_factor,
-                'servo_pairs': self.action.servo_pairs
-            },
-            'system': {
-                'log_level': self.system.log_level,
-                'data_dir': self.system.data_dir,
-                'backup_interval': self.system.backup_interval,
-                'max_backup_count': self.system.max_backup_count,
-                'enable_remote': self.system.enable_remote,
-                'remote_port': self.system.remote_port
-            },
-            'network': {
-                'host': self.network.host,
-                'port': self.network.port,
-                'ssl_enabled': self.network.ssl_enabled,
-                'ssl_cert': self.network.ssl_cert,
-                'ssl_key': self.network.ssl_key,
-                'max_connections': self.network.max_connections,
-                'timeout': self.network.timeout,
-                'retry_interval': self.network.retry_interval
-            },
-            'security': {
-                'enable_auth': self.security.enable_auth,
-                'token_expire': self.security.token_expire,
-                'max_attempts': self.security.max_attempts,
-                'lockout_time': self.security.lockout_time,
-                'allowed_ips': self.security.allowed_ips,
-                'admin_users': self.security.admin_users
-            },
-            'performance': {
-                'max_threads': self.performance.max_threads,
-                'queue_size': self.performance.queue_size,
-                'cache_size': self.performance.cache_size,
-                'batch_size': self.performance.batch_size,
-                'enable_gpu': self.performance.enable_gpu,
-                'profile_enabled': self.performance.profile_enabled
-            }
-        }
-        
-        # 保存当前配置
-        config_file = os.path.join(self.config_dir, 'config.yaml')
-        with open(config_file, 'w') as f:
-            yaml.safe_dump(config_data, f, default_flow_style=False)
+        # 保存版本时需要完整字典，否则逐段生成，避免同时持有整份配置
+        config_data = self._to_dict() if version_name else None
+        sections = config_data.items() if config_data else self._iter_sections()
+        
+        # 保存当前配置，逐段输出到带缓冲的临时文件后原子替换，
+        # 避免读取到写了一半的配置
+        config_file = self._config_path
+        temp_file = config_file + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            for name, section in sections:
+                yaml.dump({name: section}, f, Dumper=_Dumper, **_YAML_DUMP_OPTIONS)
+        os.replace(temp_file, config_file)
             
-        # 保存版本
+        # 保存版本，同名且内容相同的版本仍存在时直接复用
         if version_name:
-            self.version_manager.save_version(
-                version_name,
+            digest = _config_digest(config_data)
+            if (digest == self._last_saved_digest and
+                    version_name == self._last_saved_version_id and
+                    os.path.isdir(os.path.join(self.version_manager.base_dir, version_name))):
+                return self._last_saved_version_id
+                
+            version_id = self.version_manager.save_version(
                 config_data,
+                version_name,
                 comment
             )
+            self._last_saved_digest = digest
+            self._last_saved_version_id = version_id
+            return version_id
+            
+        return None
             
     def add_servo(self, servo_id: str, config: Dict[str, Any]):
         """添加舵机配置"""
@@ -213,10 +417,7 @@ class RobotConfig:
                     updates: Dict[str, Any]):
         """更新舵机配置"""
         if servo_id in self.servos:
-            servo = self.servos[servo_id]
-            for key, value in updates.items():
-                if hasattr(servo, key):
-                    setattr(servo, key, value)
+            _apply_updates(self.servos[servo_id], _SERVO_FIELD_SET, updates)
                     
     def get_servo_config(self, servo_id: str) -> Optional[ServoConfig]:
         """获取舵机配置"""
@@ -224,34 +425,37 @@ class RobotConfig:
         
     def update_action_config(self, updates: Dict[str, Any]):
         """更新动作配置"""
-        for key, value in updates.items():
-            if hasattr(self.action, key):
-                setattr(self.action, key, value)
+        _apply_updates(self.action, _SECTION_FIELD_SETS['action'], updates)
                 
     def update_system_config(self, updates: Dict[str, Any]):
         """更新系统配置"""
-        for key, value in updates.items():
-            if hasattr(self.system, key):
-                setattr(self.system, key, value)
+        _apply_updates(self.system, _SECTION_FIELD_SETS['system'], updates)
                 
     def update_network_config(self, updates: Dict[str, Any]):
         """更新网络配置"""
-        for key, value in updates.items():
-            if hasattr(self.network, key):
-                setattr(self.network, key, value)
+        _apply_updates(self.network, _SECTION_FIELD_SETS['network'], updates)
                 
     def update_security_config(self, updates: Dict[str, Any]):
         """更新安全配置"""
-        for key, value in updates.items():
-            if hasattr(self.security, key):
-                setattr(self.security, key, value)
+        _apply_updates(self.security, _SECTION_FIELD_SETS['security'], updates)
                 
     def update_performance_config(self, updates: Dict[str, Any]):
         """更新性能配置"""
-        for key, value in updates.items():
-            if hasattr(self.performance, key):
-                setattr(self.performance, key, value)
+        _apply_updates(self.performance, _SECTION_FIELD_SETS['performance'], updates)
                 
+    def _iter_sections(self) -> Iterator[tuple]:
+        """按输出顺序逐段产生 (段名, 可序列化字典)"""
+        yield 'servos', {
+            servo_id: dict(zip(_SERVO_KEYS, _SERVO_GET(servo)))
+            for servo_id, servo in self.servos.items()
+        }
+        for name, keys in _SECTION_KEYS.items():
+            yield name, dict(zip(keys, _SECTION_FIELDS[name](getattr(self, name))))
+            
+    def _to_dict(self) -> Dict[str, Any]:
+        """将当前配置转换为可序列化的字典"""
+        return dict(self._iter_sections())
+        
     def export_config(self, format: str = 'yaml') -> str:
         """导出配置
         
@@ -261,66 +465,9 @@ class RobotConfig:
         Returns:
             配置字符串
         """
-        config_data = {
-            'servos': {
-                servo_id: {
-                    'min_angle': servo.min_angle,
-                    'max_angle': servo.max_angle,
-                    'default_speed': servo.default_speed,
-                    'acceleration': servo.acceleration,
-                    'inverse': servo.inverse,
-                    'offset': servo.offset,
-                    'calibration': servo.calibration
-                }
-                for servo_id, servo in self.servos.items()
-            },
-            'action': {
-                'max_velocity': self.action.max_velocity,
-                'min_delay': self.action.min_delay,
-                'interpolation': self.action.interpolation,
-                'smoothing_factor': self.action.smoothing_factor,
-                'servo_pairs': self.action.servo_pairs
-            },
-            'system': {
-                'log_level': self.system.log_level,
-                'data_dir': self.system.data_dir,
-                'backup_interval': self.system.backup_interval,
-                'max_backup_count': self.system.max_backup_count,
-                'enable_remote': self.system.enable_remote,
-                'remote_port': self.system.remote_port
-            },
-            'network': {
-                'host': self.network.host,
-                'port': self.network.port,
-                'ssl_enabled': self.network.ssl_enabled,
-                'ssl_cert': self.network.ssl_cert,
-                'ssl_key': self.network.ssl_key,
-                'max_connections': self.network.max_connections,
-                'timeout': self.network.timeout,
-                'retry_interval': self.network.retry_interval
-            },
-            'security': {
-                'enable_auth': self.security.enable_auth,
-                'token_expire': self.security.token_expire,
-                'max_attempts': self.security.max_attempts,
-                'lockout_time': self.security.lockout_time,
-                'allowed_ips': self.security.allowed_ips,
-                'admin_users': self.security.admin_users
-            },
-            'performance': {
-                'max_threads': self.performance.max_threads,
-                'queue_size': self.performance.queue_size,
-                'cache_size': self.performance.cache_size,
-                'batch_size': self.performance.batch_size,
-                'enable_gpu': self.performance.enable_gpu,
-                'profile_enabled': self.performance.profile_enabled
-            }
-        }
+        config_data = self._to_dict()
         
-        if format == 'json':
-            return json.dumps(config_data, indent=2)
-        else:
-            return yaml.safe_dump(config_data, default_flow_style=False)
+        return _EXPORTERS.get(format, _dump_yaml)(config_data)
             
     def import_config(self, config_str: str, format: str = 'yaml'):
         """导入配置
@@ -330,9 +477,10 @@ class RobotConfig:
             format: 配置格式 ('yaml' 或 'json')
         """
         if format == 'json':
-            config_data = json.loads(config_str)
+            config_data = (orjson.loads(config_str) if orjson is not None
+                           else json.loads(config_str))
         else:
-            config_data = yaml.safe_load(config_str)
+            config_data = yaml.load(config_str, Loader=_Loader)
             
         self._parse_config(config_data)
         
@@ -342,72 +490,67 @@ class RobotConfig:
         Returns:
             错误信息列表
         """
-        errors = []
+        return list(self._iter_errors())
         
+    def _iter_errors(self) -> Iterator[str]:
+        """逐条产生配置错误，调用方可在首个错误处提前结束"""
         # 验证舵机配置
         for servo_id, servo in self.servos.items():
-            if servo.min_angle >= servo.max_angle:
-                errors.append(
-                    f"舵机 {servo_id} 角度范围无效: "
-                    f"{servo.min_angle} >= {servo.max_angle}"
-                )
+            min_angle, max_angle = servo.min_angle, servo.max_angle
+            if min_angle >= max_angle:
+                yield f"舵机 {servo_id} 角度范围无效: {min_angle} >= {max_angle}"
             if servo.default_speed <= 0:
-                errors.append(
-                    f"舵机 {servo_id} 默认速度无效: {servo.default_speed}"
-                )
+                yield f"舵机 {servo_id} 默认速度无效: {servo.default_speed}"
             if servo.acceleration <= 0:
-                errors.append(
-                    f"舵机 {servo_id} 加速度无效: {servo.acceleration}"
-                )
+                yield f"舵机 {servo_id} 加速度无效: {servo.acceleration}"
                 
         # 验证动作配置
-        if self.action.max_velocity <= 0:
-            errors.append(f"最大速度无效: {self.action.max_velocity}")
-        if self.action.min_delay <= 0:
-            errors.append(f"最小延时无效: {self.action.min_delay}")
-        if self.action.smoothing_factor < 0 or self.action.smoothing_factor > 1:
-            errors.append(
-                f"平滑因子无效: {self.action.smoothing_factor}"
-            )
+        action = self.action
+        if action.max_velocity <= 0:
+            yield f"最大速度无效: {action.max_velocity}"
+        if action.min_delay <= 0:
+            yield f"最小延时无效: {action.min_delay}"
+        if action.smoothing_factor < 0 or action.smoothing_factor > 1:
+            yield f"平滑因子无效: {action.smoothing_factor}"
             
         # 验证系统配置
-        if self.system.backup_interval <= 0:
-            errors.append(
-                f"备份间隔无效: {self.system.backup_interval}"
-            )
-        if self.system.max_backup_count <= 0:
-            errors.append(
-                f"最大备份数无效: {self.system.max_backup_count}"
-            )
-        if self.system.remote_port <= 0:
-            errors.append(f"远程端口无效: {self.system.remote_port}")
+        system = self.system
+        if system.backup_interval <= 0:
+            yield f"备份间隔无效: {system.backup_interval}"
+        if system.max_backup_count <= 0:
+            yield f"最大备份数无效: {system.max_backup_count}"
+        if system.remote_port <= 0:
+            yield f"远程端口无效: {system.remote_port}"
             
         # 网络配置验证
-        if not self._is_valid_ip(self.network.host):
-            errors.append(f"无效的主机地址: {self.network.host}")
-        if self.network.port < 1 or self.network.port > 65535:
-            errors.append(f"无效的端口号: {self.network.port}")
-        if self.network.ssl_enabled:
-            if not os.path.exists(self.network.ssl_cert):
-                errors.append(f"SSL证书文件不存在: {self.network.ssl_cert}")
-            if not os.path.exists(self.network.ssl_key):
-                errors.append(f"SSL密钥文件不存在: {self.network.ssl_key}")
+        network = self.network
+        if not _valid_ip(network.host):
+            yield f"无效的主机地址: {network.host}"
+        if network.port < 1 or network.port > 65535:
+            yield f"无效的端口号: {network.port}"
+        if network.ssl_enabled:
+            for label, path in (('证书', network.ssl_cert), ('密钥', network.ssl_key)):
+                # 直接 stat 一次，不经过 os.path.exists 的包装
+                try:
+                    os.stat(path)
+                except (OSError, ValueError):
+                    yield f"SSL{label}文件不存在: {path}"
                 
         # 安全配置验证
-        for ip in self.security.allowed_ips:
-            if not self._is_valid_ip(ip):
-                errors.append(f"无效的IP地址: {ip}")
-        if self.security.token_expire <= 0:
-            errors.append(f"无效的令牌过期时间: {self.security.token_expire}")
+        security = self.security
+        for ip in security.allowed_ips:
+            if not _valid_ip(ip):
+                yield f"无效的IP地址: {ip}"
+        if security.token_expire <= 0:
+            yield f"无效的令牌过期时间: {security.token_expire}"
             
         # 性能配置验证
-        if self.performance.max_threads < 1:
-            errors.append(f"无效的最大线程数: {self.performance.max_threads}")
-        if self.performance.queue_size < 1:
-            errors.append(f"无效的队列大小: {self.performance.queue_size}")
+        performance = self.performance
+        if performance.max_threads < 1:
+            yield f"无效的最大线程数: {performance.max_threads}"
+        if performance.queue_size < 1:
+            yield f"无效的队列大小: {performance.queue_size}"
             
-        return errors
-        
     def _parse_config(self, config_data: Dict):
         """解析配置数据"""
         # 解析舵机配置
@@ -418,26 +561,10 @@ class RobotConfig:
                 **servo_data
             )
             
-        # 解析动作配置
-        action_data = config_data.get('action', {})
-        self.action = ActionConfig(**action_data)
-        
-        # 解析系统配置
-        system_data = config_data.get('system', {})
-        self.system = SystemConfig(**system_data)
-        
-        # 解析网络配置
-        network_data = config_data.get('network', {})
-        self.network = NetworkConfig(**network_data)
-        
-        # 解析安全配置
-        security_data = config_data.get('security', {})
-        self.security = SecurityConfig(**security_data)
-        
-        # 解析性能配置
-        performance_data = config_data.get('performance', {})
-        self.performance = PerformanceConfig(**performance_data)
-        
+        # 解析各配置段
+        for name, cls in _SECTION_TYPES.items():
+            setattr(self, name, cls(**config_data.get(name, _EMPTY_SECTION)))
+            
     def _get_default_config(self) -> Dict:
         """获取默认配置"""
         return {
@@ -482,10 +609,18 @@ class RobotConfig:
         
     def apply_template(self, template_name: str):
         """应用配置模板"""
-        if template_name not in self.templates:
-            raise ValueError(f"未知的模板名称: {template_name}")
+        # 未访问过 templates 时直接从不可变的内置模板复制，无需生成整套副本
+        templates = self.__dict__.get('templates')
+        if templates is None:
+            if template_name not in _TEMPLATES:
+                raise ValueError(f"未知的模板名称: {template_name}")
+            template = _thaw(_TEMPLATES[template_name])
+        else:
+            if template_name not in templates:
+                raise ValueError(f"未知的模板名称: {template_name}")
+            # 复制模板，避免配置对象与模板共享可变数据
+            template = copy.deepcopy(templates[template_name])
             
-        template = self.templates[template_name]
         self._parse_config(template)
         
     def migrate_config(self, old_config: Dict) -> Dict[str, Any]:
@@ -499,12 +634,7 @@ class RobotConfig:
                 for servo_id, old_servo in old_config['servos'].items():
                     new_servo = {}
                     # 处理字段名变更
-                    field_mapping = {
-                        'min_pos': 'min_angle',
-                        'max_pos': 'max_angle',
-                        'speed': 'default_speed'
-                    }
-                    for old_key, new_key in field_mapping.items():
+                    for old_key, new_key in _SERVO_FIELD_MIGRATION:
                         if old_key in old_servo:
                             new_servo[new_key] = old_servo[old_key]
                             migration_log.append(
@@ -541,99 +671,9 @@ class RobotConfig:
             'log': migration_log
         }
         
-    def _get_minimal_template(self) -> Dict:
-        """最小配置模板"""
-        return {
-            'servos': {},
-            'action': {
-                'max_velocity': 200.0,
-                'min_delay': 0.02,
-                'interpolation': 'linear',
-                'smoothing_factor': 0.1
-            },
-            'system': {
-                'log_level': 'INFO',
-                'data_dir': 'data'
-            }
-        }
-        
-    def _get_standard_template(self) -> Dict:
-        """标准配置模板"""
-        return {
-            'servos': {
-                'servo1': {
-                    'min_angle': -90,
-                    'max_angle': 90,
-                    'default_speed': 100,
-                    'acceleration': 200
-                }
-            },
-            'action': {
-                'max_velocity': 300.0,
-                'min_delay': 0.02,
-                'interpolation': 'cubic',
-                'smoothing_factor': 0.2,
-                'servo_pairs': {
-                    'left_arm': 'right_arm'
-                }
-            },
-            'system': {
-                'log_level': 'INFO',
-                'data_dir': 'data',
-                'backup_interval': 3600,
-                'max_backup_count': 10
-            },
-            'network': {
-                'host': '0.0.0.0',
-                'port': 8080,
-                'ssl_enabled': False
-            },
-            'security': {
-                'enable_auth': True,
-                'token_expire': 3600,
-                'allowed_ips': ['127.0.0.1']
-            }
-        }
-        
-    def _get_advanced_template(self) -> Dict:
-        """高级配置模板"""
-        config = self._get_standard_template()
-        config.update({
-            'performance': {
-                'max_threads': 8,
-                'queue_size': 200,
-                'cache_size': 2000,
-                'batch_size': 64,
-                'enable_gpu': True,
-                'profile_enabled': True
-            },
-            'network': {
-                'host': '0.0.0.0',
-                'port': 8443,
-                'ssl_enabled': True,
-                'ssl_cert': 'certs/server.crt',
-                'ssl_key': 'certs/server.key',
-                'max_connections': 20
-            },
-            'security': {
-                'enable_auth': True,
-                'token_expire': 7200,
-                'max_attempts': 5,
-                'lockout_time': 600,
-                'allowed_ips': ['127.0.0.1', '192.168.1.0/24'],
-                'admin_users': ['admin']
-            }
-        })
-        return config
-        
     def _is_valid_ip(self, ip: str) -> bool:
         """验证IP地址格式"""
-        import re
-        pattern = r'^(\d{1,3}\.){3}\d{1,3}(/\d{1,2})?$'
-        if not re.match(pattern, ip):
-            return False
-        parts = ip.split('/')[0].split('.')
-        return all(0 <= int(part) <= 255 for part in parts)
+        return _valid_ip(ip)
     
     def check_health(self) -> Dict[str, Any]:
         """执行配置健康检查
@@ -651,9 +691,12 @@ class RobotConfig:
         # 检查配置完整性
         missing_fields = []
         for servo_id, servo in self.servos.items():
-            for field in ['min_angle', 'max_angle', 'default_speed']:
-                if not hasattr(servo, field):
-                    missing_fields.append(f'servo.{servo_id}.{field}')
+            # ServoConfig 构造时所有字段都已赋值，只需检查外部放入的其他对象
+            if type(servo) is ServoConfig:
+                continue
+            for name in _REQUIRED_SERVO_FIELDS:
+                if not hasattr(servo, name):
+                    missing_fields.append(f'servo.{servo_id}.{name}')
                 
         if missing_fields:
             health['status'] = 'degraded'
@@ -663,7 +706,7 @@ class RobotConfig:
             })
         
         # 检查配置值范围
-        if self.performance.max_threads > os.cpu_count():
+        if self.performance.max_threads > _CPU_COUNT:
             health['warnings'].append({
                 'type': 'high_thread_count',
                 'message': f'线程数 ({self.performance.max_threads}) 超过CPU核心数'
@@ -682,14 +725,20 @@ class RobotConfig:
         """估算配置占用内存"""
         import sys
         
+        def sizeof(obj) -> int:
+            # slots 实例本身不含字段值，需累加各字段对象的大小
+            return sys.getsizeof(obj) + sum(
+                sys.getsizeof(getattr(obj, name, None))
+                for name in getattr(obj, '__slots__', ()))
+        
         size = 0
         size += sys.getsizeof(self.servos)
-        size += sum(sys.getsizeof(servo) for servo in self.servos.values())
-        size += sys.getsizeof(self.action)
-        size += sys.getsizeof(self.system)
-        size += sys.getsizeof(self.network)
-        size += sys.getsizeof(self.security)
-        size += sys.getsizeof(self.performance)
+        size += sum(sizeof(servo) for servo in self.servos.values())
+        size += sizeof(self.action)
+        size += sizeof(self.system)
+        size += sizeof(self.network)
+        size += sizeof(self.security)
+        size += sizeof(self.performance)
         
         return size
         
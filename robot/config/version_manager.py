@@ -1,10 +1,99 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import yaml
 import os
-import shutil
 import time
 import logging
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
+# 列出版本时并发读取 info.yaml 的最大线程数
+LIST_IO_WORKERS = 16
+
+# 清理旧版本时并发删除目录的最大线程数
+CLEANUP_WORKERS = 8
+
+# 版本时间戳格式
+_TS_FMT = '%Y%m%d_%H%M%S'
+
+def _compare_dict(d1: Dict, d2: Dict, path: str = '',
+                  first_diff_only: bool = False) -> Dict:
+    """比较两个配置字典，返回以点号路径为键的差异
+    
+    使用显式栈迭代遍历嵌套字典，两侧为同一对象的子树直接跳过。
+    first_diff_only 为 True 时找到第一处差异即返回。
+    """
+    differences = {}
+    stack = [(path, d1, d2)]
+    
+    while stack:
+        prefix, left, right = stack.pop()
+        
+        # 键只在其中一个字典中存在
+        for key in left.keys() - right.keys():
+            current_path = f"{prefix}.{key}" if prefix else key
+            differences[current_path] = {'type': 'removed', 'value': left[key]}
+            if first_diff_only:
+                return differences
+        for key in right.keys() - left.keys():
+            current_path = f"{prefix}.{key}" if prefix else key
+            differences[current_path] = {'type': 'added', 'value': right[key]}
+            if first_diff_only:
+                return differences
+            
+        for key in left.keys() & right.keys():
+            old_value = left[key]
+            new_value = right[key]
+            if old_value is new_value:
+                continue
+            current_path = f"{prefix}.{key}" if prefix else key
+            # 两个都是字典，继续比较子树
+            if isinstance(old_value, dict) and isinstance(new_value, dict):
+                stack.append((current_path, old_value, new_value))
+            # 值不同
+            elif old_value != new_value:
+                differences[current_path] = {
+                    'type': 'modified',
+                    'old_value': old_value,
+                    'new_value': new_value
+                }
+                if first_diff_only:
+                    return differences
+                
+    return differences
+
+def _read_bytes(path: str) -> Optional[bytes]:
+    """读取文件内容，文件不存在或无法读取时返回None"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+def _write_atomic(path: str, data: str):
+    """一次写入完整内容到临时文件，再原子替换目标文件"""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb', buffering=0) as f:
+        f.write(data.encode('utf-8'))
+    os.replace(temp_path, path)
+
+def _fast_rmtree(path: str):
+    """删除版本目录
+
+    版本目录结构固定（配置文件 + 元数据），直接用 scandir/unlink 删除，
+    省去 shutil.rmtree 的额外 stat 与错误处理开销
+    """
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                _fast_rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+    os.rmdir(path)
 
 class ConfigVersionManager:
     def __init__(self, base_dir: str = 'config_versions',
@@ -21,6 +110,10 @@ class ConfigVersionManager:
         self.max_versions = max_versions
         self.logger = logger
         
+        # 版本信息缓存：版本ID -> (info.yaml 的 mtime_ns, 版本信息)
+        # 目录每次都重新扫描，缓存只用于跳过未变化文件的解析
+        self._info_cache: Dict[str, Tuple[int, Dict]] = {}
+        
         # 创建版本存储目录
         os.makedirs(base_dir, exist_ok=True)
         
@@ -37,7 +130,8 @@ class ConfigVersionManager:
             版本ID
         """
         # 生成版本ID
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        now = datetime.now()
+        timestamp = now.strftime(_TS_FMT)
         version_id = version_name or f"v_{timestamp}"
         
         # 创建版本目录
@@ -47,23 +141,24 @@ class ConfigVersionManager:
         try:
             # 保存配置文件
             config_path = os.path.join(version_dir, 'config.yaml')
-            with open(config_path, 'w') as f:
-                yaml.dump(config, f)
+            _write_atomic(config_path, yaml.dump(
+                config, Dumper=_Dumper, default_flow_style=False))
                 
             # 保存版本信息
             info = {
                 'version_id': version_id,
                 'timestamp': timestamp,
                 'comment': comment,
-                'created_at': datetime.now().isoformat()
+                'created_at': now.isoformat()
             }
             
             info_path = os.path.join(version_dir, 'info.yaml')
-            with open(info_path, 'w') as f:
-                yaml.dump(info, f)
+            _write_atomic(info_path, yaml.dump(
+                info, Dumper=_Dumper, default_flow_style=False))
+            self._info_cache[version_id] = (os.stat(info_path).st_mtime_ns, info)
                 
             if self.logger:
-                self.logger.info(f"保存配置版本: {version_id}")
+                self.logger.info("保存配置版本: %s", version_id)
                 
             # 清理旧版本
             self._cleanup_old_versions()
@@ -72,7 +167,7 @@ class ConfigVersionManager:
             
         except Exception as e:
             if self.logger:
-                self.logger.error(f"保存版本失败: {e}")
+                self.logger.error("保存版本失败: %s", e)
             raise
             
     def load_version(self, version_id: str) -> Optional[Dict]:
@@ -81,106 +176,191 @@ class ConfigVersionManager:
         
         if not os.path.exists(config_path):
             if self.logger:
-                self.logger.error(f"版本不存在: {version_id}")
+                self.logger.error("版本不存在: %s", version_id)
             return None
             
         try:
             with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_Loader)
                 
             if self.logger:
-                self.logger.info(f"加载配置版本: {version_id}")
+                self.logger.info("加载配置版本: %s", version_id)
                 
             return config
             
         except Exception as e:
             if self.logger:
-                self.logger.error(f"加载版本失败: {e}")
+                self.logger.error("加载版本失败: %s", e)
             return None
             
     def get_version_info(self, version_id: str) -> Optional[Dict]:
         """获取版本信息"""
-        info_path = os.path.join(self.base_dir, version_id, 'info.yaml')
+        info = self._read_version_info(version_id)
+        return dict(info) if info else info
         
-        if not os.path.exists(info_path):
+    def _read_version_info(self, version_id: str) -> Optional[Dict]:
+        """读取版本信息，文件未变化时使用缓存（返回缓存对象本身，调用方不得修改）"""
+        info_path = os.path.join(self.base_dir, version_id, 'info.yaml')
+        try:
+            mtime_ns = os.stat(info_path).st_mtime_ns
+        except OSError:
+            self._info_cache.pop(version_id, None)
             return None
             
+        cached = self._info_cache.get(version_id)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+            
         try:
-            with open(info_path, 'r') as f:
-                return yaml.safe_load(f)
+            with open(info_path, 'rb') as f:
+                info = yaml.load(f, Loader=_Loader)
         except Exception:
             return None
             
+        if info:
+            self._info_cache[version_id] = (mtime_ns, info)
+        return info
+        
     def list_versions(self) -> List[Dict]:
         """列出所有版本"""
-        versions = []
+        entries = self._scan_version_info()
+        
+        # 按时间戳排序，时间戳相同时以 info.yaml 的修改时间区分先后
+        entries.sort(key=lambda entry: (entry[1]['timestamp'], entry[0]), reverse=True)
+        return [dict(info) for _, info in entries]
+        
+    def _scan_version_info(self) -> List[Tuple[int, Dict]]:
+        """扫描版本目录，返回 (mtime_ns, 版本信息) 列表
         
-        for version_id in os.listdir(self.base_dir):
-            info = self.get_version_info(version_id)
-            if info:
-                versions.append(info)
+        未变化的 info.yaml 直接使用缓存，新增或修改的文件并发读取后在当前线程中解析，
+        已不存在的版本从缓存中移除
+        """
+        entries = []
+        pending = []
+        present = set()
+        with os.scandir(self.base_dir) as it:
+            for entry in it:
+                if not entry.is_dir():
+                    continue
+                info_path = os.path.join(entry.path, 'info.yaml')
+                try:
+                    mtime_ns = os.stat(info_path).st_mtime_ns
+                except OSError:
+                    continue
+                present.add(entry.name)
+                cached = self._info_cache.get(entry.name)
+                if cached is not None and cached[0] == mtime_ns:
+                    entries.append(cached)
+                else:
+                    pending.append((entry.name, info_path, mtime_ns))
+                    
+        for version_id in self._info_cache.keys() - present:
+            del self._info_cache[version_id]
+            
+        if pending:
+            paths = [info_path for _, info_path, _ in pending]
+            with ThreadPoolExecutor(max_workers=min(LIST_IO_WORKERS, len(paths))) as executor:
+                contents = list(executor.map(_read_bytes, paths))
                 
-        # 按时间戳排序
-        return sorted(versions, key=lambda x: x['timestamp'], reverse=True)
+            for (version_id, _, mtime_ns), data in zip(pending, contents):
+                if data is None:
+                    continue
+                try:
+                    info = yaml.load(data, Loader=_Loader)
+                except Exception:
+                    continue
+                if info:
+                    cached = self._info_cache[version_id] = (mtime_ns, info)
+                    entries.append(cached)
+                    
+        return entries
         
-    def compare_versions(self, version1: str, version2: str) -> Dict:
-        """比较两个版本的差异"""
+    def compare_versions(self, version1: str, version2: str,
+                         first_diff_only: bool = False) -> Dict:
+        """比较两个版本的差异
+        
+        Args:
+            version1: 旧版本ID
+            version2: 新版本ID
+            first_diff_only: 只返回找到的第一处差异
+        """
         config1 = self.load_version(version1)
         config2 = self.load_version(version2)
         
         if not config1 or not config2:
             return {}
             
-        def _compare_dict(d1: Dict, d2: Dict, path: str = '') -> Dict:
-            differences = {}
-            
-            # 检查所有键
-            all_keys = set(d1.keys()) | set(d2.keys())
+        return _compare_dict(config1, config2, first_diff_only=first_diff_only)
+        
+    def versions_differ(self, version1: str, version2: str) -> bool:
+        """判断两个版本的配置是否不同，找到第一处差异即停止"""
+        return bool(self.compare_versions(version1, version2, first_diff_only=True))
+        
+    def compare_with_dict(self, config: Dict, version_id: str) -> Dict:
+        """比较内存中的配置与指定版本的差异
+        
+        无需先将配置保存为临时版本，只加载目标版本。
+        
+        Args:
+            config: 当前配置数据
+            version_id: 作为基准的版本ID
             
-            for key in all_keys:
-                current_path = f"{path}.{key}" if path else key
-                
-                # 键只在其中一个字典中存在
-                if key not in d1:
-                    differences[current_path] = {'type': 'added', 'value': d2[key]}
-                elif key not in d2:
-                    differences[current_path] = {'type': 'removed', 'value': d1[key]}
-                # 两个都是字典，递归比较
-                elif isinstance(d1[key], dict) and isinstance(d2[key], dict):
-                    nested_diff = _compare_dict(d1[key], d2[key], current_path)
-                    differences.update(nested_diff)
-                # 值不同
-                elif d1[key] != d2[key]:
-                    differences[current_path] = {
-                        'type': 'modified',
-                        'old_value': d1[key],
-                        'new_value': d2[key]
-                    }
-                    
-            return differences
+        Returns:
+            差异字典，以版本配置为旧值、config 为新值
+        """
+        base = self.load_version(version_id)
+        
+        if not base or not config:
+            return {}
             
-        return _compare_dict(config1, config2)
+        return _compare_dict(base, config)
         
     def rollback(self, version_id: str) -> Optional[Dict]:
         """回滚到指定版本"""
         config = self.load_version(version_id)
-        if config:
+        if config and not self._matches_latest(version_id, config):
             # 保存当前配置作为新版本
             self.save_version(config, comment=f"Rollback to {version_id}")
         return config
         
+    def _matches_latest(self, version_id: str, config: Dict) -> bool:
+        """判断配置是否与最新版本相同，相同时回滚无需再保存"""
+        versions = self.list_versions()
+        if not versions:
+            return False
+            
+        latest_id = versions[0]['version_id']
+        if latest_id == version_id:
+            return True
+            
+        return self.load_version(latest_id) == config
+        
     def _cleanup_old_versions(self):
         """清理旧版本"""
         versions = self.list_versions()
         
         if len(versions) > self.max_versions:
-            # 删除最旧的版本
-            for version in versions[self.max_versions:]:
-                version_dir = os.path.join(self.base_dir, version['version_id'])
-                try:
-                    shutil.rmtree(version_dir)
-                    if self.logger:
-                        self.logger.info(f"删除旧版本: {version['version_id']}")
-                except Exception as e:
+            # 删除最旧的版本，多个目录时并发删除
+            version_ids = [version['version_id'] for version in versions[self.max_versions:]]
+            if len(version_ids) > 1:
+                with ThreadPoolExecutor(
+                        max_workers=min(CLEANUP_WORKERS, len(version_ids))) as executor:
+                    results = list(executor.map(self._remove_version_dir, version_ids))
+            else:
+                results = [self._remove_version_dir(version_ids[0])]
+                
+            for version_id, error in zip(version_ids, results):
+                if error is None:
+                    self._info_cache.pop(version_id, None)
                     if self.logger:
-                        self.logger.error(f"删除版本失败: {e}")
\ No newline at end of file
+                        self.logger.info("删除旧版本: %s", version_id)
+                elif self.logger:
+                    self.logger.error("删除版本失败: %s", error)
+                    
+    def _remove_version_dir(self, version_id: str) -> Optional[Exception]:
+        """删除版本目录，返回删除过程中的异常"""
+        try:
+            _fast_rmtree(os.path.join(self.base_dir, version_id))
+        except Exception as e:
+            return e
+        return None
@@ -0,0 +1,40 @@
+"""PIDController 基础计算用的 numba 内核
+
+未安装 numba 时 AVAILABLE 为 False，由调用方回退到纯 Python 实现。
+积分/输出限幅默认为 ±inf，因此不启用 fastmath（其假设不存在 inf）。
+"""
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+AVAILABLE = njit is not None
+
+if AVAILABLE:
+    @njit(cache=True)
+    def pid_step(error, integral, last_error, kp, ki, kd,
+                 integral_min, integral_max, deadband, dt):
+        """单步PID计算，返回 (输出, 新积分值, 新上次误差)"""
+        if abs(error) < deadband:
+            return 0.0, 0.0, 0.0
+            
+        integral += error * dt
+        if integral < integral_min:
+            integral = integral_min
+        elif integral > integral_max:
+            integral = integral_max
+            
+        derivative = (error - last_error) / dt if dt > 0 else 0.0
+        output = kp * error + ki * integral + kd * derivative
+        return output, integral, error
+
+
+def warmup():
+    """预编译 pid_step
+    
+    内核在首次调用时才 JIT 编译，导入本模块不会触发编译。
+    控制循环对首次调用延迟敏感时，可在启动阶段显式调用本函数。
+    未安装 numba 时不做任何事。
+    """
+    if AVAILABLE:
+        pid_step(0.0, 0.0, 0.0, 1.0, 0.0, 0.0, -float('inf'), float('inf'), 0.0, 0.02)
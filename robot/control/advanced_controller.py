@@ -1,4 +1,7 @@
-from typing import Dict, List, Optional, Protocol
+from typing import Deque, Dict, Optional, Protocol
+from collections import deque
+from itertools import islice
+import math
 import numpy as np
 import logging
 from abc import ABC, abstractmethod
@@ -15,6 +18,53 @@ class LearningController(Protocol):
         """预测动作"""
         pass
 
+# 性能指标保留的历史长度，以及 get_metrics 统计的最近样本数
+METRICS_WINDOW = 500
+METRICS_RECENT = 100
+
+class MetricWindow:
+    """定长指标窗口
+    
+    超出 maxlen 的旧值自动丢弃，并维护最近 recent 个值的滑动和，
+    使最近均值的计算为 O(1)。
+    """
+    
+    def __init__(self, maxlen: int = METRICS_WINDOW, recent: int = METRICS_RECENT):
+        self.values: Deque[float] = deque(maxlen=max(maxlen, recent))
+        self.recent = recent
+        self.recent_sum = 0.0
+        
+    def append(self, value: float):
+        values = self.values
+        # 最近窗口满时，先减去即将移出窗口的值
+        if len(values) >= self.recent:
+            self.recent_sum -= values[-self.recent]
+        values.append(value)
+        self.recent_sum += value
+        
+    def recent_mean(self) -> float:
+        """最近 recent 个值的均值，无数据时返回 nan"""
+        count = min(len(self.values), self.recent)
+        if not count:
+            return float('nan')
+            
+        # 出现过 inf/nan 时滑动和无法通过减法恢复（inf - inf 为 nan），
+        # 从窗口重新求和，非有限值移出窗口后即恢复
+        if not math.isfinite(self.recent_sum):
+            values = self.values
+            self.recent_sum = sum(islice(values, len(values) - count, None))
+        return self.recent_sum / count
+        
+    def clear(self):
+        self.values.clear()
+        self.recent_sum = 0.0
+        
+    def __len__(self) -> int:
+        return len(self.values)
+        
+    def __iter__(self):
+        return iter(self.values)
+
 class AdvancedController(MotionController):
     """高级控制器基类"""
     
@@ -26,16 +76,22 @@ class AdvancedController(MotionController):
         self.learner: Optional[LearningController] = None
         
         # 状态历史
-        self.state_history: List[Dict] = []
         self.max_history = config.get('max_history', 1000)
+        self.state_history: Deque[Dict] = deque(maxlen=self.max_history)
         
         # 性能指标
         self.performance_metrics = {
-            'mse': [],
-            'mae': [],
-            'rewards': []
+            'mse': MetricWindow(),
+            'mae': MetricWindow(),
+            'rewards': MetricWindow()
         }
         
+        # 误差统计使用的键缓存
+        self._metric_target_keys: frozenset = frozenset()
+        self._metric_key_set: frozenset = frozenset()
+        self._metric_missing: frozenset = frozenset()
+        self._metric_keys: tuple = ()
+        
     def update(self, state: Dict, dt: float) -> Dict:
         """更新控制
         
@@ -43,8 +99,6 @@ class AdvancedController(MotionController):
         """
         # 保存状态历史
         self.state_history.append(state)
-        if len(self.state_history) > self.max_history:
-            self.state_history.pop(0)
             
         # 获取学习预测
         if self.learner:
@@ -76,23 +130,32 @@ class AdvancedController(MotionController):
         target = state.get('target', {})
         current = state.get('current', {})
         
-        errors = []
-        abs_errors = []
-        
-        for key in target:
-            if key in current:
-                error = target[key] - current[key]
-                errors.append(error * error)
-                abs_errors.append(abs(error))
-                
-        if errors:
-            self.performance_metrics['mse'].append(np.mean(errors))
-            self.performance_metrics['mae'].append(np.mean(abs_errors))
+        # 参与统计的键只在目标/当前键集合变化时重新确定；判断时只做包含检查，
+        # 不构造新的集合(目标键中上次缺失的键通常为空)
+        target_keys = target.keys()
+        missing = self._metric_missing
+        if (target_keys != self._metric_target_keys
+                or not current.keys() >= self._metric_key_set
+                or (missing and any(key in current for key in missing))):
+            self._metric_target_keys = frozenset(target_keys)
+            self._metric_keys = tuple(key for key in target if key in current)
+            self._metric_key_set = frozenset(self._metric_keys)
+            self._metric_missing = self._metric_target_keys - self._metric_key_set
+            
+        keys = self._metric_keys
+        if not keys:
+            return
+            
+        count = len(keys)
+        error = (np.fromiter(map(target.__getitem__, keys), float, count) -
+                 np.fromiter(map(current.__getitem__, keys), float, count))
+        self.performance_metrics['mse'].append(float(np.dot(error, error)) / count)
+        self.performance_metrics['mae'].append(float(np.abs(error).sum()) / count)
             
     def get_metrics(self) -> Dict:
         """获取性能指标"""
         return {
-            'mse': np.mean(self.performance_metrics['mse'][-100:]),
-            'mae': np.mean(self.performance_metrics['mae'][-100:]),
-            'rewards': np.mean(self.performance_metrics['rewards'][-100:])
+            'mse': self.performance_metrics['mse'].recent_mean(),
+            'mae': self.performance_metrics['mae'].recent_mean(),
+            'rewards': self.performance_metrics['rewards'].recent_mean()
         } 
\ No newline at end of file
@@ -1,5 +1,6 @@
 from typing import Dict, Optional, Tuple
-import numpy as np
+import math
+from types import MappingProxyType
 import logging
 from .pid_controller import PIDController
 
@@ -19,10 +20,16 @@ class BalanceController:
         self.pitch_controller = PIDController(**config.get('pitch', {}))
         self.yaw_controller = PIDController(**config.get('yaw', {}))
         
-        # 状态变量
+        # 状态变量，原地更新，不在每个控制周期重新创建
         self.target_angles = {'roll': 0.0, 'pitch': 0.0, 'yaw': 0.0}
         self.current_angles = {'roll': 0.0, 'pitch': 0.0, 'yaw': 0.0}
         
+        # 非快照模式下复用的状态字典，姿态为只读视图
+        self._state_view = {
+            'target_angles': MappingProxyType(self.target_angles),
+            'current_angles': MappingProxyType(self.current_angles)
+        }
+        
         # 补偿参数
         self.gravity_comp = config.get('gravity_compensation', 0.0)
         self.gyro_comp = config.get('gyro_compensation', 0.0)
@@ -38,29 +45,17 @@ class BalanceController:
             控制输出
         """
         # 更新当前姿态
-        self.current_angles = {
-            'roll': imu_data.get('roll', 0.0),
-            'pitch': imu_data.get('pitch', 0.0),
-            'yaw': imu_data.get('yaw', 0.0)
-        }
+        current = self.current_angles
+        roll = current['roll'] = imu_data.get('roll', 0.0)
+        pitch = current['pitch'] = imu_data.get('pitch', 0.0)
+        yaw = current['yaw'] = imu_data.get('yaw', 0.0)
         
         # 计算各轴控制输出
+        target = self.target_angles
         outputs = {
-            'roll': self.roll_controller.compute(
-                self.target_angles['roll'],
-                self.current_angles['roll'],
-                dt
-            ),
-            'pitch': self.pitch_controller.compute(
-                self.target_angles['pitch'],
-                self.current_angles['pitch'],
-                dt
-            ),
-            'yaw': self.yaw_controller.compute(
-                self.target_angles['yaw'],
-                self.current_angles['yaw'],
-                dt
-            )
+            'roll': self.roll_controller.compute(target['roll'], roll, dt),
+            'pitch': self.pitch_controller.compute(target['pitch'], pitch, dt),
+            'yaw': self.yaw_controller.compute(target['yaw'], yaw, dt)
         }
         
         # 添加补偿
@@ -83,11 +78,12 @@ class BalanceController:
                           imu_data: Dict) -> Dict[str, float]:
         """应用补偿"""
         # 重力补偿
-        outputs['pitch'] += np.sin(np.radians(self.current_angles['pitch'])) * self.gravity_comp
+        # 单个标量使用 math 函数，避免 NumPy ufunc 的调用开销
+        outputs['pitch'] += math.sin(math.radians(self.current_angles['pitch'])) * self.gravity_comp
         
         # 陀螺仪补偿
-        if 'gyro' in imu_data:
-            gyro = imu_data['gyro']
+        gyro = imu_data.get('gyro')
+        if gyro is not None:
             outputs['roll'] += gyro.get('x', 0.0) * self.gyro_comp
             outputs['pitch'] += gyro.get('y', 0.0) * self.gyro_comp
             outputs['yaw'] += gyro.get('z', 0.0) * self.gyro_comp
@@ -99,14 +95,26 @@ class BalanceController:
         self.roll_controller.reset()
         self.pitch_controller.reset()
         self.yaw_controller.reset()
-        self.target_angles = {'roll': 0.0, 'pitch': 0.0, 'yaw': 0.0}
+        self.target_angles.update(roll=0.0, pitch=0.0, yaw=0.0)
         
-    def get_state(self) -> Dict:
-        """获取控制器状态"""
-        return {
-            'target_angles': self.target_angles.copy(),
-            'current_angles': self.current_angles.copy(),
-            'roll_stats': self.roll_controller.get_stats(),
-            'pitch_stats': self.pitch_controller.get_stats(),
-            'yaw_stats': self.yaw_controller.get_stats()
-        } 
\ No newline at end of file
+    def get_state(self, snapshot: bool = True) -> Dict:
+        """获取控制器状态
+        
+        Args:
+            snapshot: 为 True 时返回可修改的副本；为 False 时返回复用的状态字典，
+                姿态为随控制更新变化的只读视图，适合高频轮询
+        """
+        if snapshot:
+            return {
+                'target_angles': self.target_angles.copy(),
+                'current_angles': self.current_angles.copy(),
+                'roll_stats': self.roll_controller.get_stats(),
+                'pitch_stats': self.pitch_controller.get_stats(),
+                'yaw_stats': self.yaw_controller.get_stats()
+            }
+            
+        state = self._state_view
+        state['roll_stats'] = self.roll_controller.get_stats(snapshot=False)
+        state['pitch_stats'] = self.pitch_controller.get_stats(snapshot=False)
+        state['yaw_stats'] = self.yaw_controller.get_stats(snapshot=False)
+        return state
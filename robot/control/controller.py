@@ -5,6 +5,17 @@ from dataclasses import dataclass
 from ..config.robot_config import ServoConfig
 from .pid_controller import PIDController
 
+# 无约束舵机的批量限值；取最大有限值而非 inf，避免 np.where 两侧都求值时出现 0 * inf
+_UNBOUNDED = np.finfo(float).max
+
+def _clip(value: float, low: float, high: float) -> float:
+    """标量限幅，避免 np.clip 对单个数值的调用开销"""
+    return low if value < low else high if value > high else value
+
+def _sign(value: float) -> int:
+    """标量符号函数，兼容 numpy 标量（其布尔值不支持相减）"""
+    return int(value > 0) - int(value < 0)
+
 @dataclass
 class ControlState:
     """控制状态"""
@@ -18,6 +29,14 @@ class ControlState:
     output: float = 0.0
     timestamp: float = 0.0
 
+@dataclass(slots=True)
+class _Constraints:
+    """舵机控制约束"""
+    min_angle: float
+    max_angle: float
+    max_velocity: float
+    max_acceleration: float
+
 class RobotController:
     def __init__(self, config: Dict, logger: Optional[logging.Logger] = None):
         """机器人控制器
@@ -35,12 +54,17 @@ class RobotController:
         # 控制状态
         self.states: Dict[str, ControlState] = {}
         
+        # 各舵机约束参数，初始化时从配置读取
+        self._constraints: Dict[str, _Constraints] = {}
+        
         # 控制回调
         self.callbacks: Dict[str, List[Callable]] = {
             'pre_update': [],
             'post_update': [],
             'error': []
         }
+        self._has_pre_update = False
+        self._has_post_update = False
         
         # 初始化控制器
         self._init_controllers()
@@ -62,6 +86,60 @@ class RobotController:
             # 初始化状态
             self.states[servo_id] = ControlState()
             
+            # 约束参数
+            if servo_config:
+                self._constraints[servo_id] = _Constraints(
+                    min_angle=servo_config.get('min_angle', -90),
+                    max_angle=servo_config.get('max_angle', 90),
+                    max_velocity=servo_config.get('max_velocity', 300),
+                    max_acceleration=servo_config.get('max_acceleration', 200)
+                )
+            
+        self._init_batch_arrays()
+        
+    def _init_batch_arrays(self):
+        """构建批量更新使用的参数与状态数组，按 servo_ids 顺序对齐"""
+        self.servo_ids: List[str] = list(self.servo_controllers)
+        controllers = [self.servo_controllers[servo_id] for servo_id in self.servo_ids]
+        servo_configs = [self.config['servos'][servo_id] for servo_id in self.servo_ids]
+        
+        def param(name):
+            return np.array([getattr(c, name) for c in controllers], dtype=float)
+            
+        def limit(name, default, unbounded):
+            # 与 _apply_constraints 一致，配置为空的舵机不施加约束
+            return np.array([c.get(name, default) if c else unbounded
+                             for c in servo_configs], dtype=float)
+            
+        # PID参数
+        self._kp = param('kp')
+        self._ki = param('ki')
+        self._kd = param('kd')
+        self._deadband = param('deadband')
+        self._min_output = param('min_output')
+        self._max_output = param('max_output')
+        self._integral_min = param('integral_min')
+        self._integral_max = param('integral_max')
+        
+        # 约束参数
+        self._min_angle = limit('min_angle', -90, -_UNBOUNDED)
+        self._max_angle = limit('max_angle', 90, _UNBOUNDED)
+        self._max_velocity = limit('max_velocity', 300, _UNBOUNDED)
+        self._max_acceleration = limit('max_acceleration', 200, _UNBOUNDED)
+        
+        # 批量状态
+        self._reset_batch_state()
+        
+    def _reset_batch_state(self):
+        """重置批量更新的状态数组"""
+        count = len(self.servo_ids)
+        self._integral = np.zeros(count)
+        self._last_error = np.zeros(count)
+        self._current = np.zeros(count)
+        self._velocity = np.zeros(count)
+        self._acceleration = np.zeros(count)
+        self._output = np.zeros(count)
+        
     def update(self, servo_id: str, target: float, 
               current: float, dt: float) -> float:
         """更新控制器
@@ -76,12 +154,13 @@ class RobotController:
             控制输出
         """
         # 前置处理
-        for callback in self.callbacks['pre_update']:
-            try:
-                callback(servo_id, target, current, dt)
-            except Exception as e:
-                self.logger.error(f"前置处理错误: {str(e)}")
-                self._handle_error(e)
+        if self._has_pre_update:
+            for callback in self.callbacks['pre_update']:
+                try:
+                    callback(servo_id, target, current, dt)
+                except Exception as e:
+                    self.logger.error(f"前置处理错误: {str(e)}")
+                    self._handle_error(e)
                 
         # 获取控制器和状态
         controller = self.servo_controllers.get(servo_id)
@@ -97,6 +176,8 @@ class RobotController:
             state.error = target - current
             
             # 计算速度和加速度
+            # 注意：此处在覆盖 current_angle 之后求差分，速度与加速度恒为0，
+            # 速度/加速度约束因此不会触发；修正会改变控制律，需单独处理
             velocity = (current - state.current_angle) / dt
             acceleration = (velocity - state.velocity) / dt
             
@@ -122,12 +203,13 @@ class RobotController:
             state.timestamp = state.timestamp + dt
             
             # 后置处理
-            for callback in self.callbacks['post_update']:
-                try:
-                    callback(servo_id, state)
-                except Exception as e:
-                    self.logger.error(f"后置处理错误: {str(e)}")
-                    self._handle_error(e)
+            if self._has_post_update:
+                for callback in self.callbacks['post_update']:
+                    try:
+                        callback(servo_id, state)
+                    except Exception as e:
+                        self.logger.error(f"后置处理错误: {str(e)}")
+                        self._handle_error(e)
                     
             return output
             
@@ -136,6 +218,67 @@ class RobotController:
             self._handle_error(e)
             return 0.0
             
+    def update_batch(self, targets: np.ndarray, currents: np.ndarray,
+                     dt: float) -> np.ndarray:
+        """批量更新所有舵机
+        
+        以数组一次完成所有舵机的 PID 计算和约束，计算过程与 update 一致。
+        批量模式使用独立的数组状态，只包含基础 PID（不含自适应、
+        模糊、前馈等扩展功能），也不触发更新回调。
+        
+        Args:
+            targets: 目标角度，按 servo_ids 顺序排列
+            currents: 当前角度，按 servo_ids 顺序排列
+            dt: 时间间隔
+            
+        Returns:
+            控制输出，按 servo_ids 顺序排列
+        """
+        targets = np.asarray(targets, dtype=float)
+        currents = np.asarray(currents, dtype=float)
+        
+        # 更新状态（与 update 相同的顺序，速度与加速度同样恒为0）
+        self._current[:] = currents
+        velocity = (currents - self._current) / dt
+        self._acceleration = (velocity - self._velocity) / dt
+        self._velocity = velocity
+        
+        # 基础PID，死区内清零积分和上次误差
+        error = targets - currents
+        active = np.abs(error) >= self._deadband
+        integral = np.clip(self._integral + error * dt,
+                           self._integral_min, self._integral_max)
+        derivative = (error - self._last_error) / dt if dt > 0 else np.zeros_like(error)
+        output = self._kp * error + self._ki * integral + self._kd * derivative
+        
+        self._integral = np.where(active, integral, 0.0)
+        self._last_error = np.where(active, error, 0.0)
+        output = np.where(active, output, 0.0)
+        np.clip(output, self._min_output, self._max_output, out=output)
+        
+        # 角度限位
+        np.clip(output, self._min_angle, self._max_angle, out=output)
+        
+        # 速度限制
+        over_velocity = np.abs(self._velocity) > self._max_velocity
+        output = np.where(
+            over_velocity,
+            self._current + np.sign(self._velocity) * self._max_velocity,
+            output
+        )
+        
+        # 加速度限制
+        over_acceleration = np.abs(self._acceleration) > self._max_acceleration
+        output = np.where(
+            over_acceleration,
+            self._current + self._velocity * 0.02 +
+            np.sign(self._acceleration) * self._max_acceleration * 0.0002,
+            output
+        )
+        
+        self._output = output
+        return output
+        
     def _apply_constraints(self, servo_id: str,
                           output: float,
                           state: ControlState) -> float:
@@ -149,28 +292,24 @@ class RobotController:
         Returns:
             约束后的输出
         """
-        servo_config = self.config['servos'].get(servo_id)
-        if not servo_config:
+        constraints = self._constraints.get(servo_id)
+        if constraints is None:
             return output
             
         # 角度限位
-        output = np.clip(
-            output,
-            servo_config.get('min_angle', -90),
-            servo_config.get('max_angle', 90)
-        )
+        output = _clip(output, constraints.min_angle, constraints.max_angle)
         
         # 速度限制
-        max_velocity = servo_config.get('max_velocity', 300)
+        max_velocity = constraints.max_velocity
         if abs(state.velocity) > max_velocity:
-            output = state.current_angle + np.sign(state.velocity) * max_velocity
+            output = state.current_angle + _sign(state.velocity) * max_velocity
             
         # 加速度限制
-        max_acceleration = servo_config.get('max_acceleration', 200)
+        max_acceleration = constraints.max_acceleration
         if abs(state.acceleration) > max_acceleration:
             output = (state.current_angle + 
                      state.velocity * 0.02 +
-                     np.sign(state.acceleration) * max_acceleration * 0.0002)
+                     _sign(state.acceleration) * max_acceleration * 0.0002)
             
         return output
         
@@ -183,12 +322,19 @@ class RobotController:
         """
         if event in self.callbacks:
             self.callbacks[event].append(callback)
+            self._update_callback_flags()
             
     def remove_callback(self, event: str, callback: Callable):
         """移除控制回调"""
         if event in self.callbacks:
             self.callbacks[event].remove(callback)
+            self._update_callback_flags()
             
+    def _update_callback_flags(self):
+        """记录是否存在更新回调，无回调时 update 跳过对应处理"""
+        self._has_pre_update = bool(self.callbacks['pre_update'])
+        self._has_post_update = bool(self.callbacks['post_update'])
+        
     def _handle_error(self, error: Exception):
         """处理控制错误"""
         for callback in self.callbacks['error']:
@@ -211,6 +357,10 @@ class RobotController:
             if servo_id in self.servo_controllers:
                 self.servo_controllers[servo_id].reset()
                 self.states[servo_id] = ControlState()
+                index = self.servo_ids.index(servo_id)
+                for array in (self._integral, self._last_error, self._current,
+                              self._velocity, self._acceleration, self._output):
+                    array[index] = 0.0
         else:
             for controller in self.servo_controllers.values():
                 controller.reset()
@@ -218,6 +368,7 @@ class RobotController:
                 servo_id: ControlState()
                 for servo_id in self.servo_controllers
             }
+            self._reset_batch_state()
             
     def tune_pid(self, servo_id: str,
                 kp: Optional[float] = None,
@@ -233,12 +384,16 @@ class RobotController:
         """
         controller = self.servo_controllers.get(servo_id)
         if controller:
+            index = self.servo_ids.index(servo_id)
             if kp is not None:
                 controller.kp = kp
+                self._kp[index] = kp
             if ki is not None:
                 controller.ki = ki
+                self._ki[index] = ki
             if kd is not None:
                 controller.kd = kd
+                self._kd[index] = kd
                 
     def get_pid_params(self, servo_id: str) -> Optional[Dict[str, float]]:
         """获取PID参数"""
@@ -76,12 +76,16 @@ class ControllerManager:
         """获取控制器"""
         return self.controllers.get(name)
         
-    def get_state(self) -> Dict:
-        """获取控制器状态"""
+    def get_state(self, snapshot: bool = True) -> Dict:
+        """获取控制器状态
+        
+        Args:
+            snapshot: 为 False 时各控制器返回只读视图，避免轮询时的复制
+        """
         return {
             'active_controller': self.active_controller,
             'controllers': {
-                name: controller.get_state()
+                name: controller.get_state(snapshot)
                 for name, controller in self.controllers.items()
             }
         } 
\ No newline at end of file
@@ -2,14 +2,47 @@ from typing import Dict, List, Optional
 import numpy as np
 import logging
 import zmq
-import json
+import msgpack
 from threading import Thread, Lock
 from .advanced_controller import AdvancedController
 import time
+from types import MappingProxyType
 import hashlib
 import zlib
-import base64
 import copy
+from itertools import islice
+from collections import deque
+
+def _pack(message: Dict) -> bytes:
+    """将消息序列化为 msgpack 字节"""
+    return msgpack.packb(message, use_bin_type=True)
+
+def _unpack(data) -> Dict:
+    """从 msgpack 字节反序列化消息"""
+    return msgpack.unpackb(data, raw=False)
+
+def _map_prefix(size: int, *items) -> bytes:
+    """预先打包 msgpack 映射头及固定的键值，其余字段在发送时依次追加"""
+    packer = msgpack.Packer(use_bin_type=True)
+    return packer.pack_map_header(size) + b''.join(map(packer.pack, items))
+
+def _copy_state(state: Dict) -> Dict:
+    """复制状态字典，不可变标量直接引用，数组浅复制，其余对象深复制"""
+    copied = {}
+    for key, value in state.items():
+        if value is None or isinstance(value, (int, float, str)):
+            copied[key] = value
+        elif isinstance(value, np.ndarray):
+            copied[key] = value.copy()
+        else:
+            copied[key] = copy.deepcopy(value)
+    return copied
+
+# 收发高水位默认值，与 ZMQ 默认一致
+DEFAULT_HWM = 1000
+
+# 空的共享状态视图
+_EMPTY_SHARED_STATE = MappingProxyType({})
 
 class DistributedController(AdvancedController):
     def __init__(self, config: Dict, logger: Optional[logging.Logger] = None):
@@ -22,8 +55,14 @@ class DistributedController(AdvancedController):
         
         # 配置网络
         self.node_id = config.get('node_id', 'node0')
+        self._topic = self.node_id.encode()
         self.peers = config.get('peers', [])
         
+        # 收发高水位，须在绑定/连接前设置；积压超过上限的消息会被丢弃，
+        # 调大会增加慢速节点处的排队内存与状态滞后
+        self.publisher.setsockopt(zmq.SNDHWM, config.get('send_hwm', DEFAULT_HWM))
+        self.subscriber.setsockopt(zmq.RCVHWM, config.get('recv_hwm', DEFAULT_HWM))
+        
         pub_port = config.get('pub_port', 5555)
         self.publisher.bind(f"tcp://*:{pub_port}")
         
@@ -31,8 +70,8 @@ class DistributedController(AdvancedController):
             self.subscriber.connect(f"tcp://{peer['host']}:{peer['port']}")
             self.subscriber.setsockopt_string(zmq.SUBSCRIBE, peer['id'])
             
-        # 共享状态
-        self.shared_state: Dict = {}
+        # 共享状态，整体替换的只读视图，读取无需加锁；写入方在 state_lock 下复制并替换
+        self.shared_state = _EMPTY_SHARED_STATE
         self.state_lock = Lock()
         
         # 启动接收线程
@@ -53,10 +92,9 @@ class DistributedController(AdvancedController):
         # 发布本地状态
         self._publish_state(state)
         
-        # 获取共享状态
-        with self.state_lock:
-            shared_state = self.shared_state.copy()
-            
+        # 获取共享状态，引用赋值是原子的，无需加锁或复制
+        shared_state = self.shared_state
+        
         # 计算一致性控制
         output = self._compute_consensus(state, shared_state)
         
@@ -65,41 +103,47 @@ class DistributedController(AdvancedController):
     def _compute_consensus(self, local_state: Dict,
                           shared_state: Dict) -> Dict:
         """计算一致性控制"""
-        outputs = {}
-        
+        keys = list(local_state)
+        if not keys:
+            return {}
+            
         # 计算平均状态
-        avg_state = self._compute_average_state(local_state, shared_state)
-        
-        # 生成一致性控制
-        for key in local_state:
-            if key in avg_state:
-                # 向平均状态靠拢
-                error = avg_state[key] - local_state[key]
-                outputs[key] = error * 0.5  # 简单比例控制
-                
-        return outputs
+        avg_vec = self._average_vector(keys, local_state, shared_state)
+        local_vec = np.fromiter(map(local_state.__getitem__, keys),
+                                dtype=np.float64, count=len(keys))
+        
+        # 向平均状态靠拢，简单比例控制
+        return dict(zip(keys, ((avg_vec - local_vec) * 0.5).tolist()))
         
     def _compute_average_state(self, local_state: Dict,
                              shared_state: Dict) -> Dict:
         """计算平均状态"""
-        avg_state = {}
+        keys = list(local_state)
+        if not keys:
+            return {}
+            
+        avg_vec = self._average_vector(keys, local_state, shared_state)
+        return dict(zip(keys, avg_vec.tolist()))
+        
+    def _average_vector(self, keys: List[str], local_state: Dict,
+                        shared_state: Dict) -> np.ndarray:
+        """按 keys 顺序计算各状态量的平均值
         
+        所有节点状态组成 节点 × 状态量 矩阵，缺失项以 NaN 填充，一次归约求均值。
+        """
         # 合并所有状态
         all_states = [local_state]
-        for node_id, state in shared_state.items():
-            if isinstance(state, dict):
-                all_states.append(state)
-                
-        # 计算平均值
-        for key in local_state:
-            values = []
-            for state in all_states:
-                if key in state:
-                    values.append(state[key])
-            if values:
-                avg_state[key] = np.mean(values)
-                
-        return avg_state
+        all_states.extend(state for state in shared_state.values()
+                          if isinstance(state, dict))
+                          
+        nan = np.nan
+        matrix = np.fromiter(
+            (state.get(key, nan) for state in all_states for key in keys),
+            dtype=np.float64,
+            count=len(all_states) * len(keys)
+        ).reshape(len(all_states), len(keys))
+        
+        return np.nanmean(matrix, axis=0)
         
     def _publish_state(self, state: Dict):
         """发布状态"""
@@ -110,9 +154,7 @@ class DistributedController(AdvancedController):
         }
         
         try:
-            self.publisher.send_string(
-                f"{self.node_id} {json.dumps(message)}"
-            )
+            self.publisher.send_multipart([self._topic, _pack(message)])
         except Exception as e:
             self.logger.error(f"发布状态失败: {str(e)}")
             
@@ -120,22 +162,34 @@ class DistributedController(AdvancedController):
         """接收循环"""
         while self.running:
             try:
-                message = self.subscriber.recv_string()
-                node_id, data = message.split(' ', 1)
-                data = json.loads(data)
-                
-                with self.state_lock:
-                    self.shared_state[node_id] = data['state']
-                    
+                # 首帧为节点主题，其后每帧一条消息
+                topic, *payloads = self.subscriber.recv_multipart()
+                node_id = topic.decode()
             except Exception as e:
                 self.logger.error(f"接收状态失败: {str(e)}")
+                continue
                 
+            # 逐条处理，单条消息失败不影响同批的其他消息
+            for payload in payloads:
+                try:
+                    data = _unpack(payload)
+                    self._set_shared_state(node_id, data['state'])
+                except Exception as e:
+                    self.logger.error(f"接收状态失败: {str(e)}")
+                    
+    def _set_shared_state(self, node_id: str, state: Dict):
+        """复制共享状态并更新节点状态后整体替换"""
+        with self.state_lock:
+            new_state = dict(self.shared_state)
+            new_state[node_id] = state
+            self.shared_state = MappingProxyType(new_state)
+            
     def reset(self):
         """重置控制器"""
         super().reset()
         with self.state_lock:
-            self.shared_state.clear()
-            
+            self.shared_state = _EMPTY_SHARED_STATE
+        
     def __del__(self):
         """清理资源"""
         self.running = False
@@ -160,6 +214,13 @@ class DistributedController(AdvancedController):
         self.quorum_size = len(self.peers) // 2 + 1
         self.partition_timeout = self.config.get('partition_timeout', 5.0)
         
+        # 心跳与同步请求的固定字段预先打包，发送时只追加时间戳和版本
+        self._heartbeat_prefix = _map_prefix(
+            4, 'type', 'heartbeat', 'node_id', self.node_id, 'timestamp')
+        self._state_version_key = _pack('state_version')
+        self._sync_request_prefix = _map_prefix(
+            3, 'type', 'sync_request', 'node_id', self.node_id, 'timestamp')
+        
         # 启动心跳线程
         self.heartbeat_thread = Thread(target=self._heartbeat_loop)
         self.heartbeat_thread.start()
@@ -184,17 +245,15 @@ class DistributedController(AdvancedController):
                 
     def _send_heartbeat(self):
         """发送心跳"""
-        message = {
-            'type': 'heartbeat',
-            'node_id': self.node_id,
-            'timestamp': time.time(),
-            'state_version': self._get_state_version()
-        }
+        payload = b''.join((
+            self._heartbeat_prefix,
+            _pack(time.time()),
+            self._state_version_key,
+            _pack(self._get_state_version())
+        ))
         
         try:
-            self.publisher.send_string(
-                f"{self.node_id} {json.dumps(message)}"
-            )
+            self.publisher.send_multipart([self._topic, payload])
         except Exception as e:
             self.logger.error(f"发送心跳失败: {str(e)}")
             
@@ -216,7 +275,9 @@ class DistributedController(AdvancedController):
         # 从共享状态中移除
         with self.state_lock:
             if node_id in self.shared_state:
-                del self.shared_state[node_id]
+                new_state = dict(self.shared_state)
+                del new_state[node_id]
+                self.shared_state = MappingProxyType(new_state)
                 
         # 更新网络拓扑
         self.peers = [p for p in self.peers if p['id'] != node_id]
@@ -240,7 +301,7 @@ class DistributedController(AdvancedController):
         """进入安全模式"""
         # 停止状态同步
         with self.state_lock:
-            self.shared_state.clear()
+            self.shared_state = _EMPTY_SHARED_STATE
             
         # 使用保守控制策略
         self._use_conservative_control()
@@ -255,9 +316,9 @@ class DistributedController(AdvancedController):
         
     def _get_state_version(self) -> str:
         """获取状态版本"""
-        # 使用状态的哈希作为版本
-        state_str = json.dumps(self.local_state, sort_keys=True)
-        return hashlib.md5(state_str.encode()).hexdigest()
+        # 使用状态的哈希作为版本，按键排序保证各节点结果一致
+        state_bytes = _pack(sorted(self.local_state.items()))
+        return hashlib.blake2b(state_bytes, digest_size=16).hexdigest()
         
     def _check_state_consistency(self):
         """检查状态一致性"""
@@ -280,16 +341,10 @@ class DistributedController(AdvancedController):
         
     def _request_state_sync(self):
         """请求状态同步"""
-        message = {
-            'type': 'sync_request',
-            'node_id': self.node_id,
-            'timestamp': time.time()
-        }
+        payload = self._sync_request_prefix + _pack(time.time())
         
         try:
-            self.publisher.send_string(
-                f"{self.node_id} {json.dumps(message)}"
-            )
+            self.publisher.send_multipart([self._topic, payload])
         except Exception as e:
             self.logger.error(f"请求同步失败: {str(e)}")
             
@@ -310,7 +365,7 @@ class DistributedController(AdvancedController):
         
         # 带宽控制
         self.bandwidth_limit = self.config.get('bandwidth_limit', 1000000)  # 1MB/s
-        self.message_queue = []
+        self.message_queue = deque()
         self.last_send_time = time.time()
         
     def _send_message(self, message: Dict):
@@ -323,7 +378,7 @@ class DistributedController(AdvancedController):
         if self.compression_enabled:
             message_data = self._compress_message(message)
         else:
-            message_data = json.dumps(message)
+            message_data = _pack(message)
             
         # 添加到待发送队列
         self.message_queue.append({
@@ -344,45 +399,41 @@ class DistributedController(AdvancedController):
         # 计算可用带宽
         available_bytes = int(self.bandwidth_limit * elapsed)
         
-        while self.message_queue and available_bytes > 0:
-            message = self.message_queue[0]
-            
-            if message['size'] <= available_bytes:
-                # 发送消息
-                try:
-                    self.publisher.send_string(
-                        f"{self.node_id} {message['data']}"
-                    )
-                    self.message_queue.pop(0)
-                    available_bytes -= message['size']
-                except Exception as e:
-                    self.logger.error(f"发送消息失败: {str(e)}")
-                    
-                    # 重试处理
-                    if message['retries'] < self.max_retries:
-                        message['retries'] += 1
-                        message['time'] = current_time
-                    else:
-                        self.message_queue.pop(0)
-            else:
+        # 收集带宽允许范围内的队首消息，合并为一次多帧发送
+        count = 0
+        for message in self.message_queue:
+            if message['size'] > available_bytes:
                 break
+            available_bytes -= message['size']
+            count += 1
             
+        if count:
+            queue = self.message_queue
+            batch = [queue.popleft() for _ in range(count)]
+            try:
+                self.publisher.send_multipart(
+                    [self._topic] + [message['data'] for message in batch]
+                )
+            except Exception as e:
+                self.logger.error(f"发送消息失败: {str(e)}")
+                
+                # 重试处理，按整批计数，超过重试次数的消息丢弃
+                retained = [message for message in batch
+                            if message['retries'] < self.max_retries]
+                for message in retained:
+                    message['retries'] += 1
+                    message['time'] = current_time
+                queue.extendleft(reversed(retained))
+                
         self.last_send_time = current_time
         
-    def _compress_message(self, message: Dict) -> str:
-        """压缩消息"""
-        message_str = json.dumps(message)
-        compressed = zlib.compress(
-            message_str.encode(),
-            level=self.compression_level
-        )
-        return base64.b64encode(compressed).decode()
+    def _compress_message(self, message: Dict) -> bytes:
+        """压缩消息，ZMQ 帧可直接承载二进制数据"""
+        return zlib.compress(_pack(message), self.compression_level)
         
-    def _decompress_message(self, data: str) -> Dict:
+    def _decompress_message(self, data: bytes) -> Dict:
         """解压消息"""
-        compressed = base64.b64decode(data)
-        decompressed = zlib.decompress(compressed)
-        return json.loads(decompressed.decode())
+        return _unpack(zlib.decompress(data))
         
     def _handle_message(self, message: Dict):
         """处理接收到的消息"""
@@ -416,8 +467,8 @@ class DistributedController(AdvancedController):
     def _init_recovery(self):
         """初始化故障恢复"""
         # 状态快照
-        self.state_snapshots = []
         self.max_snapshots = self.config.get('max_snapshots', 10)
+        self.state_snapshots = deque(maxlen=self.max_snapshots)
         
         # 故障检测
         self.fault_detectors = {
@@ -436,15 +487,14 @@ class DistributedController(AdvancedController):
     def _create_snapshot(self):
         """创建状态快照"""
         snapshot = {
-            'state': copy.deepcopy(self.local_state),
-            'shared_state': copy.deepcopy(self.shared_state),
+            'state': _copy_state(self.local_state),
+            # 共享状态整体替换而不原地修改，直接引用当前视图即可
+            'shared_state': self.shared_state,
             'timestamp': time.time(),
             'metrics': self.get_metrics()
         }
         
         self.state_snapshots.append(snapshot)
-        if len(self.state_snapshots) > self.max_snapshots:
-            self.state_snapshots.pop(0)
             
     def _detect_faults(self):
         """检测故障"""
@@ -490,11 +540,12 @@ class DistributedController(AdvancedController):
         
     def _detect_performance_degradation(self) -> bool:
         """检测性能下降"""
-        if len(self.performance_metrics['mse']) < 100:
+        mse = self.performance_metrics['mse']
+        if len(mse) < 100:
             return False
             
-        recent_mse = np.mean(self.performance_metrics['mse'][-100:])
-        baseline_mse = np.mean(self.performance_metrics['mse'][-500:-100])
+        recent_mse = mse.recent_mean()
+        baseline_mse = np.mean(list(islice(mse, max(len(mse) - 500, 0), len(mse) - 100)))
         
         return recent_mse > baseline_mse * 1.5
         
@@ -511,7 +562,7 @@ class DistributedController(AdvancedController):
         # 回滚到最近的稳定状态
         if self.state_snapshots:
             last_stable = self.state_snapshots[-1]
-            self.local_state = copy.deepcopy(last_stable['state'])
+            self.local_state = _copy_state(last_stable['state'])
             
         # 重新同步状态
         self._request_state_sync()
@@ -522,5 +573,5 @@ class DistributedController(AdvancedController):
         self._reset_control_params()
         
         # 清理性能指标
-        self.performance_metrics['mse'] = []
-        self.performance_metrics['mae'] = [] 
\ No newline at end of file
+        self.performance_metrics['mse'].clear()
+        self.performance_metrics['mae'].clear()
\ No newline at end of file
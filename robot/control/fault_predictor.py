@@ -1,14 +1,65 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
 import numpy as np
 from sklearn.preprocessing import StandardScaler
 from sklearn.decomposition import PCA
 from sklearn.ensemble import IsolationForest, RandomForestClassifier
 from sklearn.svm import SVR
 from sklearn.neural_network import MLPRegressor
-import statsmodels.api as sm
 from scipy import stats
 from .performance_monitor import PerformanceMetrics
 
+def _acf(data: np.ndarray, nlags: int) -> np.ndarray:
+    """基于 FFT 计算各列的自相关函数
+    
+    Args:
+        data: 形状为 (样本数, 列数) 的数据
+        nlags: 最大滞后阶数
+        
+    Returns:
+        形状为 (min(nlags + 1, 样本数), 列数) 的自相关系数，第0行为 lag=0
+    """
+    n = data.shape[0]
+    centered = data - data.mean(axis=0)
+    
+    # 补零到 2n 避免循环相关；滞后 n 及以后已回绕，与 statsmodels 一样截断
+    spectrum = np.fft.rfft(centered, n=2 * n, axis=0)
+    acov = np.fft.irfft(spectrum * np.conj(spectrum), n=2 * n, axis=0)[:min(nlags + 1, n)]
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return acov / acov[0]
+
+@lru_cache(maxsize=None)
+def _trend_axis(n: int) -> Tuple[float, np.ndarray, float]:
+    """线性拟合的时间轴：均值、中心化后的时间轴及其平方和"""
+    x = np.arange(n, dtype=np.float64)
+    x_mean = x.mean()
+    x_centered = x - x_mean
+    x_centered.flags.writeable = False
+    return x_mean, x_centered, float(x_centered @ x_centered)
+
+def _linear_trend(data: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """对各列做最小二乘直线拟合
+    
+    Returns:
+        (斜率, 截距, 决定系数 R²)，每项长度为列数
+    """
+    x_mean, x_centered, sxx = _trend_axis(len(data))
+    y_mean = data.mean(axis=0)
+    y_centered = data - y_mean
+    
+    sxy = x_centered @ y_centered
+    syy = np.einsum('ij,ij->j', y_centered, y_centered)
+    
+    slopes = sxy / sxx
+    intercepts = y_mean - slopes * x_mean
+    
+    # 常数列的 R² 记为0，与 scipy.stats.linregress 一致
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r_squared = np.where(syy > 0, sxy * sxy / (sxx * syy), 0.0)
+        
+    return slopes, intercepts, r_squared
+
 class FaultPredictor:
     def __init__(self, config: Dict, logger: Optional[logging.Logger] = None):
         """故障预测器"""
@@ -20,6 +71,9 @@ class FaultPredictor:
         self.feature_buffer: List[np.ndarray] = []
         self.sequence_length = config.get('sequence_length', 100)
         
+        # 序列长度固定，预先计算实数 FFT 的频率轴
+        self._rfft_freqs = np.fft.rfftfreq(self.sequence_length)
+        
         # 特征工程
         self.feature_extractors = {
             'statistical': self._extract_statistical_features,
@@ -74,40 +128,38 @@ class FaultPredictor:
         
     def _extract_frequency_features(self, data: np.ndarray) -> np.ndarray:
         """提取频域特征"""
-        features = []
-        
-        # FFT变换
-        fft_values = np.fft.fft(data, axis=0)
-        frequencies = np.fft.fftfreq(len(data))
-        
-        # 主要频率分量
-        for i in range(data.shape[1]):
-            freq_magnitudes = np.abs(fft_values[:, i])
-            peak_indices = np.argsort(freq_magnitudes)[-3:]  # 取前3个峰值
-            
-            features.extend([
-                frequencies[peak_indices],
-                freq_magnitudes[peak_indices]
-            ])
+        # 实数输入使用 rfft，只计算非负频率，所有列一次完成
+        freq_magnitudes = np.abs(np.fft.rfft(data, axis=0))
+        if len(data) == self.sequence_length:
+            frequencies = self._rfft_freqs
+        else:
+            frequencies = np.fft.rfftfreq(len(data))
             
-        return np.array(features).flatten()
+        # 主要频率分量，每列部分选择前3个峰值，再按幅值升序排列保持特征顺序
+        peak_indices = np.argpartition(freq_magnitudes, -3, axis=0)[-3:]
+        peak_magnitudes = np.take_along_axis(freq_magnitudes, peak_indices, axis=0)
+        order = np.argsort(peak_magnitudes, axis=0)
+        peak_indices = np.take_along_axis(peak_indices, order, axis=0)
+        peak_magnitudes = np.take_along_axis(peak_magnitudes, order, axis=0)
+        peak_freqs = frequencies[peak_indices]
+        
+        # 按列排列为 [频率, 幅值] 并展平
+        return np.stack([peak_freqs.T, peak_magnitudes.T], axis=1).ravel()
         
     def _extract_trend_features(self, data: np.ndarray) -> np.ndarray:
         """提取趋势特征"""
         features = []
         
-        # 线性趋势
-        for i in range(data.shape[1]):
-            slope, intercept = np.polyfit(range(len(data)), data[:, i], 1)
-            features.extend([slope, intercept])
+        # 线性趋势，按列排列为 [斜率, 截距]
+        slopes, intercepts, _ = _linear_trend(data)
+        features.extend(np.column_stack((slopes, intercepts)).ravel())
             
         # 变化率
         features.extend(np.mean(np.diff(data, axis=0), axis=0))
         
-        # 周期性检测
-        for i in range(data.shape[1]):
-            acf = sm.tsa.acf(data[:, i], nlags=10)
-            features.extend(acf[1:])  # 去除lag=0的自相关
+        # 周期性检测，去除lag=0的自相关后按列展开
+        acf = _acf(data, nlags=10)
+        features.extend(acf[1:].T.ravel())
             
         return np.array(features)
         
@@ -206,21 +258,17 @@ class FaultPredictor:
             return {}
             
         recent_data = np.stack(self.feature_buffer[-10:])
-        trends = {}
-        
-        for i in range(recent_data.shape[1]):
-            # 计算趋势
-            slope, _, r_value, _, _ = stats.linregress(
-                range(len(recent_data)),
-                recent_data[:, i]
-            )
-            
-            trends[f'feature_{i}'] = {
+        
+        # 计算趋势，所有列一次拟合
+        slopes, _, r_squared = _linear_trend(recent_data)
+        
+        return {
+            f'feature_{i}': {
                 'slope': slope,
-                'r_squared': r_value ** 2
+                'r_squared': r2
             }
-            
-        return trends
+            for i, (slope, r2) in enumerate(zip(slopes.tolist(), r_squared.tolist()))
+        }
         
     def _detect_pattern(self) -> Dict:
         """检测模式"""
@@ -230,9 +278,11 @@ class FaultPredictor:
         data = np.stack(self.feature_buffer)
         patterns = {}
         
+        # 周期性检测，所有列一次计算
+        acf_all = _acf(data, nlags=20)
+        
         for i in range(data.shape[1]):
-            # 周期性检测
-            acf = sm.tsa.acf(data[:, i], nlags=20)
+            acf = acf_all[:, i]
             
             # 查找显著的自相关
             significant_lags = np.where(np.abs(acf[1:]) > 0.3)[0] + 1
@@ -17,8 +17,12 @@ class MotionController(ABC):
         pass
         
     @abstractmethod
-    def get_state(self) -> Dict:
-        """获取状态"""
+    def get_state(self, snapshot: bool = True) -> Dict:
+        """获取状态
+        
+        Args:
+            snapshot: 为 False 时允许返回只读视图而非副本
+        """
         pass
 
 class TrajectoryGenerator(Protocol):
@@ -1,6 +1,8 @@
 from typing import Optional, Dict
+from types import MappingProxyType
 import numpy as np
 import logging
+from . import _pid_kernels as kernels
 
 class PIDController:
     def __init__(self, kp: float = 1.0, ki: float = 0.0, kd: float = 0.0,
@@ -45,6 +47,10 @@ class PIDController:
             'overshoots': 0
         }
         
+        # 非快照模式下复用的统计字典及其只读视图
+        self._stats_view = {}
+        self._stats_proxy = MappingProxyType(self._stats_view)
+        
         # 自适应控制参数
         self.adaptive_config = {
             'enabled': False,
@@ -133,6 +139,15 @@ class PIDController:
         
     def _compute_pid(self, error: float, dt: float) -> float:
         """基础PID计算"""
+        if kernels.AVAILABLE:
+            output, self.integral, self.last_error = kernels.pid_step(
+                float(error), float(self.integral), float(self.last_error),
+                float(self.kp), float(self.ki), float(self.kd),
+                float(self.integral_min), float(self.integral_max),
+                float(self.deadband), float(dt)
+            )
+            return output
+            
         if abs(error) < self.deadband:
             self.integral = 0
             self.last_error = 0
@@ -297,9 +312,13 @@ class PIDController:
             'overshoots': 0
         }
         
-    def get_stats(self) -> dict:
+    def get_stats(self, snapshot: bool = True) -> dict:
         """获取性能统计
         
+        Args:
+            snapshot: 为 True 时返回新字典；为 False 时原地刷新并返回
+                复用的只读视图，其内容随下次调用变化
+        
         Returns:
             统计数据字典
         """
@@ -308,13 +327,13 @@ class PIDController:
         else:
             avg_error = 0.0
             
-        return {
-            'max_error': self.stats['max_error'],
-            'min_error': self.stats['min_error'],
-            'avg_error': avg_error,
-            'samples': self.stats['samples'],
-            'overshoots': self.stats['overshoots']
-        }
+        stats = {} if snapshot else self._stats_view
+        stats['max_error'] = self.stats['max_error']
+        stats['min_error'] = self.stats['min_error']
+        stats['avg_error'] = avg_error
+        stats['samples'] = self.stats['samples']
+        stats['overshoots'] = self.stats['overshoots']
+        return stats if snapshot else self._stats_proxy
         
     def _update_stats(self, error: float):
         """更新统计数据"""
@@ -1,4 +1,5 @@
 from typing import Dict, List, Optional
+from types import MappingProxyType
 import numpy as np
 import logging
 from .motion_controller import MotionController, TrajectoryGenerator
@@ -78,14 +79,19 @@ class TrajectoryController(MotionController):
         self.trajectory = []
         self.current_point = 0
         
-    def get_state(self) -> Dict:
-        """获取控制器状态"""
+    def get_state(self, snapshot: bool = True) -> Dict:
+        """获取控制器状态
+        
+        Args:
+            snapshot: 为 True 时复制状态字典；为 False 时返回只读视图
+        """
+        wrap = dict.copy if snapshot else MappingProxyType
         return {
-            'target_state': self.target_state.copy(),
-            'current_state': self.current_state.copy(),
+            'target_state': wrap(self.target_state),
+            'current_state': wrap(self.current_state),
             'trajectory_progress': self.current_point / len(self.trajectory) if self.trajectory else 0,
             'joint_stats': {
-                joint_id: controller.get_stats()
+                joint_id: controller.get_stats(snapshot)
                 for joint_id, controller in self.joint_controllers.items()
             }
         } 
\ No newline at end of file
@@ -0,0 +1,112 @@
+import pytest
+import numpy as np
+from robot.actions.optimizer import ActionOptimizer
+
+def _reference_continuity(frames, max_gap):
+    """逐帧复制并插入过渡帧的连续性优化，作为对照实现"""
+    optimized = []
+    for i, source in enumerate(frames):
+        frame = source.copy()
+        if i > 0:
+            prev_frame = optimized[-1]
+            for servo_id in frame:
+                if servo_id == 'delay' or servo_id not in prev_frame:
+                    continue
+                gap = abs(frame[servo_id] - prev_frame[servo_id])
+                if gap > max_gap:
+                    steps = int(np.ceil(gap / max_gap))
+                    for j in range(1, steps):
+                        transition_frame = prev_frame.copy()
+                        transition_frame[servo_id] = prev_frame[servo_id] + \
+                            j / steps * (frame[servo_id] - prev_frame[servo_id])
+                        transition_frame['delay'] = frame.get('delay', 0.02) / steps
+                        optimized.append(transition_frame)
+        optimized.append(frame)
+    return optimized
+    
+def _reference_energy(frames, max_power):
+    """逐帧复制并按功率调整延时的能量优化，作为对照实现"""
+    optimized = []
+    for i, source in enumerate(frames):
+        frame = source.copy()
+        if i > 0:
+            dt = frames[i-1].get('delay', 0.02)
+            total_power = sum(
+                (abs(frame[servo_id] - frames[i-1][servo_id]) / dt) ** 2 * 0.1
+                for servo_id in frame
+                if servo_id != 'delay' and servo_id in frames[i-1])
+            if total_power > max_power:
+                frame['delay'] = dt / np.sqrt(max_power / total_power)
+        optimized.append(frame)
+    return optimized
+    
+def _assert_frames_equal(actual, expected):
+    """比较动作序列，包括每帧的键顺序"""
+    assert len(actual) == len(expected)
+    for actual_frame, expected_frame in zip(actual, expected):
+        assert list(actual_frame) == list(expected_frame)
+        assert actual_frame == pytest.approx(expected_frame)
+        
+class TestActionOptimizer:
+    @pytest.fixture
+    def optimizer(self):
+        """创建动作优化器"""
+        return ActionOptimizer()
+    
+    @pytest.fixture
+    def frames(self):
+        """生成键顺序各不相同、包含缺失舵机与缺失延时的随机动作序列"""
+        rng = np.random.default_rng(0)
+        frames = []
+        for i in range(40):
+            servo_ids = [f's{j}' for j in rng.permutation(4) if rng.random() > 0.2]
+            frame = {servo_id: float(rng.uniform(-60, 60)) for servo_id in servo_ids}
+            if i % 3:
+                frame['delay'] = float(rng.choice([0.02, 0.05, 0.1]))
+            frames.append(frame)
+        return frames
+    
+    def test_continuity_matches_reference(self, optimizer, frames):
+        """测试连续性优化与对照实现一致，过渡帧按各帧自身的键顺序生成"""
+        _assert_frames_equal(optimizer.optimize_continuity(frames, 10.0),
+                             _reference_continuity(frames, 10.0))
+    
+    def test_continuity_transition_order(self, optimizer):
+        """测试同一帧内各舵机的过渡帧按该帧的键顺序插入"""
+        frames = [{'a': 0.0, 'b': 0.0, 'delay': 0.1}, {'b': 20.0, 'a': 20.0}]
+        optimized = optimizer.optimize_continuity(frames, 10.0)
+        
+        assert optimized[1] == {'a': 0.0, 'b': 10.0, 'delay': 0.01}
+        assert optimized[2] == {'a': 10.0, 'b': 0.0, 'delay': 0.01}
+        assert list(optimized[3]) == ['b', 'a']
+    
+    def test_energy_matches_reference(self, optimizer, frames):
+        """测试能量优化与对照实现一致，新写入的延时追加在帧末尾"""
+        _assert_frames_equal(optimizer.optimize_energy(frames, 100.0),
+                             _reference_energy(frames, 100.0))
+                             
+    @pytest.mark.parametrize('servo_pairs', [
+        {'s0': 's1', 's2': 's3'},
+        {'s0': 's1', 's1': 's2'},
+        {'s1': 's0', 's0': 's2', 's2': 's3'}
+    ])
+    def test_symmetry_matches_reference(self, optimizer, frames, servo_pairs):
+        """测试对称性优化与按顺序逐对处理的对照实现一致，包括重叠的舵机对"""
+        expected = []
+        for frame in frames:
+            new_frame = frame.copy()
+            for servo1, servo2 in servo_pairs.items():
+                if servo1 in frame and servo2 in frame:
+                    avg_angle = (frame[servo1] + frame[servo2]) / 2
+                    new_frame[servo1] = avg_angle
+                    new_frame[servo2] = avg_angle
+            expected.append(new_frame)
+            
+        _assert_frames_equal(optimizer.optimize_symmetry(frames, servo_pairs), expected)
+        
+    def test_symmetry_overlapping_pairs(self, optimizer):
+        """测试重叠舵机对中后面的舵机对覆盖前面的结果"""
+        frames = [{'a': 0.0, 'b': 10.0, 'c': 30.0}]
+        optimized = optimizer.optimize_symmetry(frames, {'a': 'b', 'b': 'c'})
+        
+        assert optimized == [{'a': 5.0, 'b': 20.0, 'c': 20.0}]
@@ -0,0 +1,49 @@
+import sys
+import numpy as np
+import pytest
+from robot.actions.sequence_editor import ActionSequenceEditor
+
+class _Scale:
+    """速度滑块替身"""
+    def get(self):
+        return 1.5
+        
+class TestSequencePreview:
+    @pytest.fixture
+    def editor(self):
+        """创建不带界面的编辑器"""
+        editor = ActionSequenceEditor.__new__(ActionSequenceEditor)
+        editor.current_sequence = [{'s0': 10.0, 'delay': 0.1}, {'s1': 20.0}]
+        editor.speed_scale = _Scale()
+        editor.set_preview_callbacks()
+        return editor
+        
+    def test_legacy_callback_receives_frames(self, editor):
+        """测试旧接口直接收到原始帧列表"""
+        calls = []
+        editor.set_preview_callbacks(sequence_callback=lambda *args: calls.append(args))
+        editor._preview_sequence()
+        
+        assert calls == [(editor.current_sequence, 1.5)]
+        
+    def test_array_callback_receives_arrays(self, editor):
+        """测试数组接口收到结构数组"""
+        calls = []
+        editor.set_preview_callbacks(
+            sequence_callback=lambda *args: pytest.fail('旧接口不应被调用'),
+            array_sequence_callback=lambda *args: calls.append(args))
+        editor._preview_sequence()
+        
+        servo_ids, angles, delays, speed = calls[0]
+        assert servo_ids == ['s0', 's1']
+        np.testing.assert_array_equal(angles, [[10.0, np.nan], [np.nan, 20.0]])
+        np.testing.assert_array_equal(delays, [0.1, 0.02])
+        assert speed == 1.5
+        
+    def test_preview_does_not_import_validator(self, editor, monkeypatch):
+        """测试预览不加载验证器及其编译内核"""
+        monkeypatch.delitem(sys.modules, 'robot.actions.validator', raising=False)
+        editor.set_preview_callbacks(array_sequence_callback=lambda *args: None)
+        editor._preview_sequence()
+        
+        assert 'robot.actions.validator' not in sys.modules
@@ -0,0 +1,111 @@
+import os
+import subprocess
+import sys
+import pytest
+import numpy as np
+from robot.actions.validator import ActionValidator
+
+def _reference_angle_issues(frames, joint_limits):
+    """逐帧逐舵机的角度限位检查，作为对照实现"""
+    issues = []
+    for i, frame in enumerate(frames):
+        frame_issues = {}
+        for servo_id, angle in frame.items():
+            if servo_id != 'delay' and servo_id in joint_limits:
+                min_angle, max_angle = joint_limits[servo_id]
+                if angle < min_angle or angle > max_angle:
+                    frame_issues[servo_id] = {
+                        'type': 'angle_limit',
+                        'value': angle,
+                        'limit': (min_angle, max_angle)
+                    }
+        if frame_issues:
+            issues.append({'frame_index': i, 'issues': frame_issues})
+    return issues
+    
+def _reference_velocity_issues(frames, max_velocity):
+    """逐帧逐舵机的速度检查，作为对照实现"""
+    issues = []
+    for i in range(1, len(frames)):
+        frame_issues = {}
+        dt = frames[i-1].get('delay', 0.02)
+        for servo_id in frames[i]:
+            if servo_id != 'delay' and servo_id in frames[i-1]:
+                velocity = abs(frames[i][servo_id] - frames[i-1][servo_id]) / dt
+                if velocity > max_velocity:
+                    frame_issues[servo_id] = {
+                        'type': 'velocity_limit',
+                        'value': pytest.approx(velocity),
+                        'limit': max_velocity
+                    }
+        if frame_issues:
+            issues.append({'frame_index': i, 'issues': frame_issues})
+    return issues
+    
+class TestActionValidator:
+    @pytest.fixture
+    def validator(self):
+        """创建动作验证器"""
+        return ActionValidator()
+        
+    @pytest.fixture
+    def frames(self):
+        """生成包含缺失舵机与自定义延时的随机动作序列"""
+        rng = np.random.default_rng(0)
+        frames = []
+        for i in range(50):
+            frame = {f's{j}': float(rng.uniform(-180, 180))
+                     for j in range(4) if rng.random() > 0.2}
+            if i % 7 == 0:
+                frame['delay'] = 0.05
+            frames.append(frame)
+        return frames
+        
+    def test_angle_limits_match_reference(self, validator, frames):
+        """测试角度限位检查与逐帧实现一致"""
+        limits = {'s0': (-90, 90), 's2': (0, 120)}
+        validator.set_joint_limits(limits)
+        
+        assert validator._check_angle_limits(frames) == \
+            _reference_angle_issues(frames, limits)
+            
+    def test_velocity_limits_match_reference(self, validator, frames):
+        """测试速度检查与逐帧实现一致"""
+        validator.max_velocity = 3000.0
+        
+        assert validator._check_velocity_limits(frames) == \
+            _reference_velocity_issues(frames, validator.max_velocity)
+            
+    def test_in_place_limit_edit(self, validator):
+        """测试原地修改 joint_limits 后立即生效"""
+        frames = [{'s0': 200.0}]
+        assert validator._check_angle_limits(frames) == []
+        
+        validator.joint_limits['s0'] = (0, 90)
+        issues = validator._check_angle_limits(frames)
+        assert issues[0]['issues']['s0']['limit'] == (0, 90)
+        
+        validator.joint_limits['s0'] = (0, 360)
+        assert validator._check_angle_limits(frames) == []
+        
+    def test_timing_issues(self, validator):
+        """测试延时过短与过长"""
+        frames = [{'s0': 0.0, 'delay': 0.001}, {'s0': 0.0}, {'s0': 0.0, 'delay': 6.0}]
+        issues = validator._check_timing(frames)
+        
+        assert [issue['frame_index'] for issue in issues] == [0, 2]
+        assert issues[0]['issues']['delay']['type'] == 'timing_too_short'
+        assert issues[1]['issues']['delay']['type'] == 'timing_too_long'
+        
+    def test_kernels_compile_lazily(self):
+        """测试导入内核模块不触发 JIT 编译，warmup 显式编译"""
+        pytest.importorskip('numba')
+        script = (
+            "from robot.actions import _validator_kernels as k\n"
+            "assert not k.analyze_velocities.signatures\n"
+            "k.warmup()\n"
+            "assert k.analyze_velocities.signatures\n"
+            "assert k.find_limit_violations.signatures\n"
+        )
+        subprocess.run([sys.executable, '-c', script], check=True,
+                       cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
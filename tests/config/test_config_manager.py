@@ -0,0 +1,74 @@
+import json
+import yaml
+import pytest
+from robot.config.config_manager import ConfigManager
+
+class TestConfigManager:
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """创建带有配置文件的配置管理器"""
+        config_path = tmp_path / 'robot_config.yaml'
+        config_path.write_text(yaml.safe_dump({
+            'network': {'host': 'localhost', 'port': 8080},
+            'sensors': {'imu': {'rate': 100}}
+        }))
+        manager = ConfigManager(str(config_path))
+        assert manager.load_config()
+        return manager
+        
+    def test_get_config_returns_live_section(self, manager):
+        """测试 get_config 返回内存中的配置段字典本身"""
+        network = manager.get_config('network')
+        assert type(network) is dict
+        assert json.loads(json.dumps(network)) == {'host': 'localhost', 'port': 8080}
+        assert yaml.safe_load(yaml.safe_dump(manager.get_config())) is not None
+        
+        # 与原有行为一致，修改返回值即修改内存配置
+        network['port'] = 9090
+        assert manager.get_config('network') is network
+        assert manager.config.network['port'] == 9090
+        
+    def test_get_config_missing_section(self, manager):
+        """测试不存在或未设置的配置段返回空字典"""
+        assert manager.get_config('dynamics') == {}
+        assert manager.get_config('unknown') == {}
+        
+    def test_get_config_view_is_read_only(self, manager):
+        """测试只读视图随 update_config 更新且不可修改"""
+        view = manager.get_config_view('network')
+        with pytest.raises(TypeError):
+            view['port'] = 9090
+            
+        assert manager.update_config('network', {'port': 9090})
+        assert view['port'] == 9090
+        
+    def test_get_config_view_unset_section(self, manager):
+        """测试未设置配置段的视图为空，不跟随之后的 update_config"""
+        view = manager.get_config_view('dynamics')
+        assert manager.update_config('dynamics', {'mass': 1.0})
+        assert dict(view) == {}
+        assert manager.get_config_view('dynamics')['mass'] == 1.0
+        
+    def test_reload_after_update(self, manager):
+        """测试 update_config 后重新加载恢复文件内容"""
+        manager.update_config('network', {'port': 9090})
+        assert manager.load_config()
+        assert manager.get_config('network')['port'] == 8080
+        
+    def test_reload_after_direct_edit(self, manager):
+        """测试直接修改内存配置后，文件未变化的重新加载同样恢复文件内容"""
+        manager.config.network = {'host': 'example.com'}
+        manager.get_config('sensors')['imu']['rate'] = 50
+        
+        assert manager.load_config()
+        assert manager.get_config('network') == {'host': 'localhost', 'port': 8080}
+        assert manager.get_config('sensors') == {'imu': {'rate': 100}}
+        
+    def test_reload_after_save(self, manager):
+        """测试保存后重新加载得到保存的内容，且与缓存互不共享"""
+        manager.update_config('network', {'port': 9090})
+        assert manager.save_config()
+        manager.get_config('network')['port'] = 1
+        
+        assert manager.load_config()
+        assert manager.get_config('network')['port'] == 9090
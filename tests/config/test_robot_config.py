@@ -0,0 +1,70 @@
+import os
+import copy
+import pytest
+from robot.config.robot_config import RobotConfig
+
+class TestRobotConfig:
+    @pytest.fixture
+    def config(self, tmp_path):
+        """创建临时目录下的配置管理器"""
+        return RobotConfig(str(tmp_path))
+        
+    def test_save_config_reuses_same_version(self, config):
+        """测试同名且内容相同的版本被复用"""
+        assert config.save_config('v1') == 'v1'
+        assert config.save_config('v1') == 'v1'
+        
+    def test_save_config_creates_new_name(self, config):
+        """测试内容相同但名称不同时仍创建新版本"""
+        config.save_config('v1')
+        assert config.save_config('v2') == 'v2'
+        
+        version_ids = {v['version_id'] for v in config.version_manager.list_versions()}
+        assert {'v1', 'v2'} <= version_ids
+        
+    def test_save_config_recreates_deleted_version(self, config):
+        """测试缓存的版本被删除后重新保存"""
+        config.save_config('v1')
+        version_dir = os.path.join(config.version_manager.base_dir, 'v1')
+        for name in os.listdir(version_dir):
+            os.remove(os.path.join(version_dir, name))
+        os.rmdir(version_dir)
+        
+        assert config.save_config('v1') == 'v1'
+        assert os.path.isdir(version_dir)
+        
+    def test_templates_are_per_instance(self, config, tmp_path):
+        """测试模板可按实例添加和修改，互不影响"""
+        other = RobotConfig(str(tmp_path / 'other'))
+        
+        config.templates['custom'] = {'system': {'log_level': 'DEBUG'}}
+        config.templates['minimal']['system']['log_level'] = 'DEBUG'
+        
+        assert 'custom' not in other.templates
+        assert other.templates['minimal']['system']['log_level'] == 'INFO'
+        
+        config.apply_template('custom')
+        assert config.system.log_level == 'DEBUG'
+        
+    def test_apply_template_does_not_share_data(self, config):
+        """测试应用模板后修改配置不影响模板"""
+        config.apply_template('standard')
+        snapshot = copy.deepcopy(config.templates['standard'])
+        
+        config.update_system_config({'log_level': 'ERROR'})
+        config.apply_template('standard')
+        assert config.templates['standard'] == snapshot
+        
+    def test_templates_thawed_lazily(self, config, tmp_path):
+        """测试未访问 templates 时不复制模板，应用模板仍得到独立数据"""
+        assert 'templates' not in vars(config)
+        
+        config.apply_template('minimal')
+        config.update_system_config({'log_level': 'ERROR'})
+        assert 'templates' not in vars(config)
+        
+        other = RobotConfig(str(tmp_path / 'other'))
+        other.apply_template('minimal')
+        assert other.system.log_level == 'INFO'
+        with pytest.raises(ValueError):
+            other.apply_template('unknown')
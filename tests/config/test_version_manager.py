@@ -0,0 +1,79 @@
+import os
+import pytest
+from robot.config.version_manager import ConfigVersionManager
+
+class TestConfigVersionManager:
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """创建临时目录下的版本管理器"""
+        return ConfigVersionManager(str(tmp_path), max_versions=3)
+        
+    def test_list_versions_newest_first(self, manager):
+        """测试版本按保存先后倒序列出"""
+        for i in range(3):
+            manager.save_version({'value': i}, f'v{i}')
+            
+        assert [v['version_id'] for v in manager.list_versions()] == ['v2', 'v1', 'v0']
+        
+    def test_cleanup_keeps_newest(self, manager):
+        """测试清理旧版本时保留最新的版本"""
+        for i in range(5):
+            manager.save_version({'value': i}, f'v{i}')
+            
+        assert sorted(os.listdir(manager.base_dir)) == ['v2', 'v3', 'v4']
+        assert [v['version_id'] for v in manager.list_versions()] == ['v4', 'v3', 'v2']
+        
+    def test_listing_sees_other_manager_changes(self, manager):
+        """测试其他管理器对同一目录的修改能被列出"""
+        other = ConfigVersionManager(manager.base_dir, max_versions=3)
+        for i in range(3):
+            manager.save_version({'value': i}, f'a{i}')
+        assert len(manager.list_versions()) == 3
+        
+        for i in range(3):
+            other.save_version({'value': i}, f'b{i}')
+            
+        assert [v['version_id'] for v in manager.list_versions()] == ['b2', 'b1', 'b0']
+        assert manager.get_version_info('a0') is None
+        
+        # 本管理器清理后目录中的版本数不超过上限
+        manager.save_version({'value': 9}, 'a9')
+        assert len(os.listdir(manager.base_dir)) == 3
+        
+    def test_listing_sees_rewritten_info(self, manager):
+        """测试同名版本被其他管理器重写后读取新信息"""
+        manager.save_version({'value': 1}, 'v1', comment='first')
+        assert manager.list_versions()[0]['comment'] == 'first'
+        
+        other = ConfigVersionManager(manager.base_dir, max_versions=3)
+        other.save_version({'value': 2}, 'v1', comment='second')
+        info_path = os.path.join(manager.base_dir, 'v1', 'info.yaml')
+        st = os.stat(info_path)
+        os.utime(info_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1000))
+        
+        assert manager.list_versions()[0]['comment'] == 'second'
+        assert manager.get_version_info('v1')['comment'] == 'second'
+        
+    def test_compare_versions(self, manager):
+        """测试版本差异比较"""
+        manager.save_version({'a': 1, 'b': {'c': 2}}, 'v1')
+        manager.save_version({'a': 1, 'b': {'c': 3}, 'd': 4}, 'v2')
+        
+        diff = manager.compare_versions('v1', 'v2')
+        assert diff == {
+            'b.c': {'type': 'modified', 'old_value': 2, 'new_value': 3},
+            'd': {'type': 'added', 'value': 4}
+        }
+        assert manager.versions_differ('v1', 'v2')
+        assert not manager.versions_differ('v1', 'v1')
+        
+    def test_rollback_skips_save_when_latest(self, manager):
+        """测试回滚到与最新版本相同的配置时不保存新版本"""
+        manager.save_version({'a': 1}, 'v1')
+        manager.save_version({'a': 2}, 'v2')
+        
+        assert manager.rollback('v2') == {'a': 2}
+        assert len(manager.list_versions()) == 2
+        
+        assert manager.rollback('v1') == {'a': 1}
+        assert len(manager.list_versions()) == 3
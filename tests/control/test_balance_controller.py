@@ -0,0 +1,58 @@
+import math
+import pytest
+from robot.control.balance_controller import BalanceController
+from robot.control.pid_controller import PIDController
+
+CONFIG = {
+    'roll': {'kp': 1.0, 'ki': 0.1, 'kd': 0.01},
+    'pitch': {'kp': 1.5},
+    'yaw': {'kp': 2.0},
+    'gravity_compensation': 0.5,
+    'gyro_compensation': 0.1
+}
+
+class TestBalanceController:
+    @pytest.fixture
+    def controller(self):
+        """创建平衡控制器"""
+        return BalanceController(CONFIG)
+        
+    def test_update_matches_independent_pids(self, controller):
+        """测试输出等于各轴PID输出加补偿"""
+        pids = {axis: PIDController(**CONFIG[axis]) for axis in ('roll', 'pitch', 'yaw')}
+        targets = {'roll': 5.0, 'pitch': -2.0, 'yaw': 0.0}
+        controller.set_target(**targets)
+        
+        for i in range(20):
+            imu = {'roll': i * 0.1, 'pitch': 1.0 - i * 0.05, 'yaw': 0.3,
+                   'gyro': {'x': 0.1, 'y': -0.2, 'z': 0.3}}
+            outputs = controller.update(imu, 0.01)
+            
+            expected = {axis: pids[axis].compute(targets[axis], imu[axis], 0.01)
+                        for axis in pids}
+            expected['pitch'] += math.sin(math.radians(imu['pitch'])) * 0.5
+            expected['roll'] += 0.1 * 0.1
+            expected['pitch'] += -0.2 * 0.1
+            expected['yaw'] += 0.3 * 0.1
+            assert outputs == pytest.approx(expected)
+            
+    def test_angles_are_dicts(self, controller):
+        """测试姿态属性为按轴名索引的字典"""
+        controller.update({'roll': 1.0, 'pitch': 2.0}, 0.01)
+        assert controller.current_angles == {'roll': 1.0, 'pitch': 2.0, 'yaw': 0.0}
+        
+        controller.set_target(yaw=3.0)
+        controller.reset()
+        assert controller.target_angles == {'roll': 0.0, 'pitch': 0.0, 'yaw': 0.0}
+        
+    def test_get_state_snapshot_and_view(self, controller):
+        """测试快照为独立副本，视图随更新变化且只读"""
+        controller.update({'roll': 1.0}, 0.01)
+        snapshot = controller.get_state()
+        view = controller.get_state(snapshot=False)
+        
+        controller.update({'roll': 2.0}, 0.01)
+        assert snapshot['current_angles']['roll'] == 1.0
+        assert view['current_angles']['roll'] == 2.0
+        with pytest.raises(TypeError):
+            view['target_angles']['roll'] = 1.0
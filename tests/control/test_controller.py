@@ -0,0 +1,50 @@
+import pytest
+import numpy as np
+from robot.control.controller import RobotController
+
+class TestRobotController:
+    @pytest.fixture
+    def config(self):
+        """创建舵机配置，包含一个无约束舵机"""
+        return {
+            'servos': {
+                'a': {'kp': 1.0, 'max_velocity': 100},
+                'b': {'kp': 2.0, 'ki': 0.5, 'deadband': 0.1},
+                'c': {}
+            }
+        }
+    
+    def test_output_tracks_target(self):
+        """测试输出按PID跟踪目标，不被速度/加速度约束替换"""
+        controller = RobotController({'servos': {'s1': {'min_angle': -90, 'max_angle': 90}}})
+        outputs = [controller.update('s1', 30.0, float(k), 0.02) for k in range(4)]
+        
+        assert outputs == pytest.approx([45.06, 28.618, 27.674, 26.728])
+        assert controller.get_state('s1').velocity == 0.0
+        
+    def test_batch_matches_update(self, config):
+        """测试批量更新与逐个更新结果一致"""
+        scalar = RobotController(config)
+        batch = RobotController(config)
+        rng = np.random.default_rng(1)
+        
+        for step in range(30):
+            targets = rng.uniform(-80, 80, 3)
+            currents = rng.uniform(-80, 80, 3) * (0.02 if step % 2 else 1.0)
+            expected = [
+                scalar.update(servo_id, target, current, 0.02)
+                for servo_id, target, current in zip(scalar.servo_ids, targets, currents)
+            ]
+            np.testing.assert_allclose(
+                batch.update_batch(targets, currents, 0.02), expected
+            )
+    
+    def test_batch_reset_servo(self, config):
+        """测试重置单个舵机只清除该舵机的批量状态"""
+        controller = RobotController(config)
+        controller.update_batch([10.0, 10.0, 10.0], [0.0, 0.0, 0.0], 0.02)
+        assert np.all(controller._integral != 0.0)
+        
+        controller.reset('b')
+        assert controller._integral[1] == 0.0
+        assert controller._integral[0] == pytest.approx(0.2)
@@ -0,0 +1,127 @@
+import threading
+import time
+import logging
+import pytest
+import numpy as np
+
+pytest.importorskip('zmq')
+pytest.importorskip('msgpack')
+
+from robot.control.distributed_controller import (
+    DistributedController, _pack, _unpack, _EMPTY_SHARED_STATE
+)
+
+class _Controller(DistributedController):
+    """实现抽象方法的测试用控制器"""
+    def get_state(self, snapshot: bool = True):
+        return {}
+        
+    def __del__(self):
+        pass
+        
+class _Publisher:
+    """记录发送帧的发布端替身"""
+    def __init__(self):
+        self.sent = []
+        
+    def send_multipart(self, frames):
+        self.sent.append(frames)
+        
+class _Subscriber:
+    """依次返回预设消息的订阅端替身，取完后停止接收循环"""
+    def __init__(self, controller, messages):
+        self.controller = controller
+        self.messages = list(messages)
+        
+    def recv_multipart(self):
+        message = self.messages.pop(0)
+        if not self.messages:
+            self.controller.running = False
+        return message
+        
+@pytest.fixture
+def controller():
+    """创建不连接网络、不启动线程的控制器"""
+    controller = _Controller.__new__(_Controller)
+    controller.logger = logging.getLogger('test')
+    controller.config = {'compression_enabled': False}
+    controller.node_id = 'n0'
+    controller._topic = b'n0'
+    controller.peers = []
+    controller.local_state = {'x': 1.0}
+    controller.shared_state = _EMPTY_SHARED_STATE
+    controller.state_lock = threading.Lock()
+    controller.publisher = _Publisher()
+    controller.running = True
+    controller._init_network_protocol()
+    return controller
+    
+class TestDistributedController:
+    def test_receive_batch_isolates_bad_frames(self, controller):
+        """测试同批中无法处理的消息不影响其他消息"""
+        batch = [
+            b'n1',
+            _pack({'type': 'heartbeat', 'node_id': 'n1'}),
+            b'\xc1',
+            _pack({'node_id': 'n1', 'state': {'x': 3.0}})
+        ]
+        controller.subscriber = _Subscriber(controller, [batch])
+        controller._receive_loop()
+        
+        assert dict(controller.shared_state) == {'n1': {'x': 3.0}}
+        
+    def test_batched_send_roundtrip(self, controller):
+        """测试队列消息合并为一次多帧发送且可解码"""
+        controller.last_send_time = time.time() + 100
+        for i in range(3):
+            controller._send_message({'type': 'state', 'state': {'x': float(i)}})
+        assert controller.publisher.sent == []
+        
+        controller.last_send_time = 0.0
+        controller._process_message_queue()
+        
+        (frames,) = controller.publisher.sent
+        assert frames[0] == b'n0'
+        assert [_unpack(frame)['state']['x'] for frame in frames[1:]] == [0.0, 1.0, 2.0]
+        assert not controller.message_queue
+        
+    def test_compression_roundtrip(self, controller):
+        """测试压缩消息可还原"""
+        message = {'type': 'state', 'state': {'x': 1.5, 'y': [1, 2]}}
+        assert controller._decompress_message(controller._compress_message(message)) == message
+        
+    def test_heartbeat_payload(self, controller, monkeypatch):
+        """测试预打包的心跳与同步请求可解码为完整消息"""
+        monkeypatch.setattr(threading.Thread, 'start', lambda self: None)
+        controller._init_fault_tolerance()
+        controller._send_heartbeat()
+        controller._request_state_sync()
+        
+        heartbeat = _unpack(controller.publisher.sent[0][1])
+        assert heartbeat.keys() == {'type', 'node_id', 'timestamp', 'state_version'}
+        assert heartbeat['type'] == 'heartbeat' and heartbeat['node_id'] == 'n0'
+        assert heartbeat['state_version'] == controller._get_state_version()
+        
+        sync = _unpack(controller.publisher.sent[1][1])
+        assert sync.keys() == {'type', 'node_id', 'timestamp'}
+        assert sync['type'] == 'sync_request'
+        
+    def test_state_version_ignores_key_order(self, controller):
+        """测试状态版本与键顺序无关"""
+        controller.local_state = {'a': 1.0, 'b': 2.0}
+        version = controller._get_state_version()
+        controller.local_state = {'b': 2.0, 'a': 1.0}
+        assert controller._get_state_version() == version
+        
+    def test_consensus_matches_reference(self, controller):
+        """测试一致性控制与逐键求均值一致"""
+        local = {'x': 1.0, 'y': 2.0, 'z': 3.0}
+        shared = {'a': {'x': 3.0, 'z': 5.0}, 'b': {'x': 5.0, 'y': 0.0, 'w': 9.0}, 'c': 'bad'}
+        states = [local, shared['a'], shared['b']]
+        
+        expected = {
+            key: (np.mean([s[key] for s in states if key in s]) - local[key]) * 0.5
+            for key in local
+        }
+        assert controller._compute_consensus(local, shared) == pytest.approx(expected)
+        assert controller._compute_consensus({}, shared) == {}
@@ -0,0 +1,62 @@
+import pytest
+import numpy as np
+
+pytest.importorskip('sklearn')
+from scipy import stats
+from robot.control.fault_predictor import _acf, _linear_trend
+
+def _reference_acf(x, nlags):
+    """逐滞后求和的自相关函数(不做样本数修正)，作为对照实现"""
+    centered = x - x.mean()
+    denominator = centered @ centered
+    return np.array([centered[:len(x) - k] @ centered[k:] / denominator
+                     for k in range(nlags + 1)])
+    
+class TestFaultPredictorHelpers:
+    @pytest.fixture
+    def data(self):
+        """生成包含周期、趋势与噪声的多列数据"""
+        rng = np.random.default_rng(0)
+        t = np.arange(100)
+        return np.column_stack([
+            np.sin(2 * np.pi * t / 12) + 0.1 * rng.standard_normal(100),
+            0.05 * t + rng.standard_normal(100),
+            rng.standard_normal(100)
+        ])
+        
+    def test_acf_matches_reference(self, data):
+        """测试 FFT 自相关与逐列直接求和一致"""
+        acf = _acf(data, nlags=20)
+        
+        assert acf.shape == (21, data.shape[1])
+        for i in range(data.shape[1]):
+            np.testing.assert_allclose(acf[:, i], _reference_acf(data[:, i], 20),
+                                       atol=1e-12)
+                                       
+    def test_acf_short_series(self):
+        """测试滞后阶数超过序列长度时只返回可用的滞后"""
+        data = np.array([[1.0], [3.0], [2.0]])
+        acf = _acf(data, nlags=10)
+        
+        assert acf.shape == (3, 1)
+        np.testing.assert_allclose(acf[:, 0], _reference_acf(data[:, 0], 2),
+                                   atol=1e-12)
+                                   
+    def test_linear_trend_matches_linregress(self, data):
+        """测试闭式直线拟合与逐列 linregress 一致"""
+        for window in (data, data[-10:]):
+            slopes, intercepts, r_squared = _linear_trend(window)
+            for i in range(window.shape[1]):
+                result = stats.linregress(np.arange(len(window)), window[:, i])
+                assert slopes[i] == pytest.approx(result.slope)
+                assert intercepts[i] == pytest.approx(result.intercept)
+                assert r_squared[i] == pytest.approx(result.rvalue ** 2)
+                
+    def test_linear_trend_constant_column(self):
+        """测试常数列斜率为0且 R² 记为0"""
+        data = np.column_stack([np.full(10, 3.0), np.arange(10.0)])
+        slopes, intercepts, r_squared = _linear_trend(data)
+        
+        np.testing.assert_allclose(slopes, [0.0, 1.0])
+        np.testing.assert_allclose(intercepts, [3.0, 0.0], atol=1e-12)
+        np.testing.assert_allclose(r_squared, [0.0, 1.0])
@@ -0,0 +1,79 @@
+import math
+import pytest
+import numpy as np
+from robot.control.advanced_controller import AdvancedController, MetricWindow
+
+class TestMetricWindow:
+    def test_recent_mean_matches_numpy(self):
+        """测试最近均值与直接对最近窗口求均值一致"""
+        rng = np.random.default_rng(0)
+        window = MetricWindow(maxlen=500, recent=100)
+        history = []
+        
+        for value in rng.normal(size=1200).tolist():
+            window.append(value)
+            history.append(value)
+            assert window.recent_mean() == pytest.approx(np.mean(history[-100:]))
+            
+        assert list(window) == history[-500:]
+        
+    def test_empty_window(self):
+        """测试空窗口返回 nan"""
+        window = MetricWindow()
+        assert math.isnan(window.recent_mean())
+        
+        window.append(1.0)
+        window.clear()
+        assert len(window) == 0
+        assert math.isnan(window.recent_mean())
+        
+    @pytest.mark.parametrize('bad_value', [float('inf'), float('-inf'), float('nan')])
+    def test_recovers_after_non_finite_sample(self, bad_value):
+        """测试非有限值移出最近窗口后均值恢复"""
+        window = MetricWindow(maxlen=500, recent=100)
+        window.append(bad_value)
+        for _ in range(99):
+            window.append(1.0)
+        assert not math.isfinite(window.recent_mean())
+        
+        window.append(1.0)
+        assert window.recent_mean() == 1.0
+        
+        for _ in range(300):
+            window.append(1.0)
+        assert window.recent_mean() == 1.0
+        
+class _Controller(AdvancedController):
+    """仅用于测试误差统计的控制器"""
+    
+    def _compute_control(self, state, predicted_action, dt):
+        return {}
+        
+    def get_state(self):
+        return {}
+        
+    def reset(self):
+        pass
+        
+class TestMetricKeys:
+    def test_errors_follow_key_changes(self):
+        """测试目标/当前键集合变化时误差统计使用的键随之更新"""
+        controller = _Controller({})
+        states = [
+            ({'a': 1.0, 'b': 2.0}, {'a': 0.0, 'b': 0.0}),
+            ({'a': 1.0, 'b': 2.0}, {'a': 0.0}),
+            ({'a': 1.0, 'b': 2.0}, {'a': 0.0, 'b': 1.0}),
+            ({'a': 1.0, 'b': 2.0}, {'a': 0.0, 'b': 1.0, 'c': 5.0}),
+            ({'a': 1.0, 'c': 2.0}, {'a': 0.0, 'b': 1.0, 'c': 5.0}),
+            ({'a': 1.0}, {'b': 1.0})
+        ]
+        
+        expected = []
+        for target, current in states:
+            controller.state_history.append({})
+            controller._update_metrics({'target': target, 'current': current}, {})
+            errors = [target[key] - current[key] for key in target if key in current]
+            if errors:
+                expected.append(np.mean(np.abs(errors)))
+                
+        assert list(controller.performance_metrics['mae']) == pytest.approx(expected)
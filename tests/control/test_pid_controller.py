@@ -1,3 +1,6 @@
+import os
+import subprocess
+import sys
 import pytest
 import numpy as np
 from robot.control.pid_controller import PIDController
@@ -181,4 +184,16 @@ class TestPIDController:
         if expected_sign == 0:
             assert abs(output) < pid.deadband
         else:
-            assert np.sign(output) == expected_sign
\ No newline at end of file
+            assert np.sign(output) == expected_sign
+        
+    def test_kernels_compile_lazily(self):
+        """测试导入内核模块不触发 JIT 编译，warmup 显式编译"""
+        pytest.importorskip('numba')
+        script = (
+            "from robot.control import _pid_kernels as k\n"
+            "assert not k.pid_step.signatures\n"
+            "k.warmup()\n"
+            "assert k.pid_step.signatures\n"
+        )
+        subprocess.run([sys.executable, '-c', script], check=True,
+                       cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))))